@@ -2,35 +2,17 @@
 import os
 import sys
 import base64
+import argparse
+import time
 
-def create_directory(path):
-    """Creates a directory if it doesn't exist."""
-    os.makedirs(path, exist_ok=True)
-
-def write_file(path, content):
-    """Writes content to a file, ensuring the directory exists."""
-    try:
-        dir_name = os.path.dirname(path)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name)
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content.strip())
-    except Exception as e:
-        print(f"Error writing file {path}: {e}", file=sys.stderr)
-        sys.exit(1)
-
-def main():
-    """Main function to generate the entire project structure and files."""
-    if os.path.exists("portfolio"):
-        print("Error: A 'portfolio' directory already exists. Please remove or rename it first.", file=sys.stderr)
-        sys.exit(1)
-
-    print("Generating the complete project structure for 'portfolio'...")
+from registry import emit_only, watch_templates
+from scaffold import ARCHIVE_FORMATS, DEFAULT_WORKERS, build_tree, report_timings, write_archive
 
+def build_project_files():
+    """Returns every template of the project keyed by output path."""
     # --- File Content Dictionary ---
     # This dictionary holds the full content for every file in the project.
-    
-    project_files = {
+    return {
         # --- Root and Config Files ---
         "portfolio/package.json": """
 {
@@ -2825,230 +2807,6 @@ import { Upload, X } from 'lucide-react';
 import Image from 'next/image';
 import { toast } from 'react-hot-toast';
 
-export function ImageUpload({ 
-  value, 
-  onChange, 
-  buttonText = 'Upload Image' 
-}: { 
-  value: string; 
-  onChange: (url: string) => void; 
-  buttonText?: string; 
-}) {
-  const [isUploading, setIsUploading] = useState(false);
-
-  const onDrop = useCallback(async (acceptedFiles: File[]) => {
-    const file = acceptedFiles[0];
-    if (!file) return;
-
-    setIsUploading(true);
-    const reader = new FileReader();
-    reader.readAsDataURL(file);
-    reader.onloadend = async () => {
-      const base64 = reader.result as string;
-      await toast.promise(
-        fetch('/api/cloudinary/upload', { 
-          method: 'POST', 
-          headers: { 'Content-Type': 'application/json' }, 
-          body: JSON.stringify({ image: base64 }) 
-        })
-          .then(async res => { 
-            if (!res.ok) throw new Error('Upload failed'); 
-            const { url } = await res.json(); 
-            onChange(url); 
-          }),
-        { 
-          loading: 'Uploading...', 
-          success: 'Image uploaded!', 
-          error: 'Upload failed.' 
-        }
-      );
-      setIsUploading(false);
-    };
-  }, [onChange]);
-
-  const { getRootProps, getInputProps, isDragActive } = useDropzone({
-    onDrop,
-    accept: { 'image/*': ['.png', '.jpg', '.jpeg', '.gif', '.webp'] },
-    maxFiles: 1,
-    disabled: isUploading,
-  });
-
-  if (value) {
-    return (
-      <div className="relative w-full aspect-video rounded-lg overflow-hidden bg-bg-primary">
-        <Image src={value} alt="Upload preview" fill className="object-cover" />
-        <button 
-          type="button" 
-          onClick={() => onChange('')} 
-          className="absolute top-2 right-2 p-1 bg-red-500/80 hover:bg-red-500 rounded-full transition-colors"
-        >
-          <X className="w-4 h-4" />
-        </button>
-      </div>
-    );
-  }
-
-  return (
-    <div 
-      {...getRootProps()} 
-      className={`border-2 border-dashed rounded-lg p-8 text-center cursor-pointer transition-colors 
-        ${isDragActive ? 'border-accent-warm bg-accent-warm/10' : 'border-text-secondary/20 hover:border-text-secondary/40'} 
-        ${isUploading ? 'opacity-50 cursor-not-allowed' : ''}`}
-    >
-      <input {...getInputProps()} />
-      <Upload className="w-8 h-8 mx-auto mb-4 text-text-secondary" />
-      <p className="text-sm text-text-secondary">
-        {isUploading ? 'Uploading...' : isDragActive ? 'Drop image here' : 'Drag & drop or click to upload'}
-      </p>
-      <p className="text-xs text-text-secondary/50 mt-1">1920x1080 recommended</p>
-    </div>
-  );
-}
-""",
-        "portfolio/components/admin/SortableItem.tsx": """
-'use client';
-
-import { useSortable } from '@dnd-kit/sortable';
-import { CSS } from '@dnd-kit/utilities';
-import { Project } from '@/lib/data';
-import { GripVertical, Pencil, Trash2 } from 'lucide-react';
-import Image from 'next/image';
-
-interface SortableItemProps {
-  id: string;
-  project: Project;
-  onEdit: (project: Project) => void;
-  onDelete: (id: string) => void;
-}
-
-export function SortableItem({ id, project, onEdit, onDelete }: SortableItemProps) {
-  const {
-    attributes,
-    listeners,
-    setNodeRef,
-    transform,
-    transition,
-    isDragging,
-  } = useSortable({ id });
-
-  const style = {
-    transform: CSS.Transform.toString(transform),
-    transition,
-    opacity: isDragging ? 0.5 : 1,
-  };
-
-  return (
-    <div ref={setNodeRef} style={style} className="glass rounded-lg p-4 flex items-center gap-4">
-      <div 
-        {...attributes} 
-        {...listeners} 
-        className="cursor-move p-2 text-text-secondary hover:text-text-primary"
-      >
-        <GripVertical className="w-5 h-5" />
-      </div>
-      <div className="w-20 h-12 relative rounded overflow-hidden flex-shrink-0 bg-bg-primary">
-        {project.thumbnail && (
-          <Image src={project.thumbnail} alt={project.title} fill sizes="80px" className="object-cover" />
-        )}
-      </div>
-      <div className="flex-1">
-        <h3 className="font-bold">{project.title}</h3>
-        <div className="text-sm text-text-secondary line-clamp-1" dangerouslySetInnerHTML={{ __html: project.description }} />
-      </div>
-      <div className="flex gap-2">
-        <button 
-          onClick={() => onEdit(project)} 
-          className="p-2 rounded hover:bg-text-primary/10 transition-colors"
-        >
-          <Pencil className="w-4 h-4" />
-        </button>
-        <button 
-          onClick={() => onDelete(project.id)} 
-          className="p-2 rounded hover:bg-red-500/20 text-red-400 transition-colors"
-        >
-          <Trash2 className="w-4 h-4" />
-        </button>
-      </div>
-    </div>
-  );
-}
-""",
-        "portfolio/components/admin/SortableExperienceItem.tsx": """
-'use client';
-
-import { useSortable } from '@dnd-kit/sortable';
-import { CSS } from '@dnd-kit/utilities';
-import { Experience } from '@/lib/data';
-import { GripVertical, Pencil, Trash2 } from 'lucide-react';
-import { format } from 'date-fns';
-
-interface SortableExperienceItemProps {
-  id: string;
-  experience: Experience;
-  onEdit: (experience: Experience) => void;
-  onDelete: (id: string) => void;
-}
-
-export function SortableExperienceItem({ id, experience, onEdit, onDelete }: SortableExperienceItemProps) {
-  const {
-    attributes,
-    listeners,
-    setNodeRef,
-    transform,
-    transition,
-    isDragging,
-  } = useSortable({ id });
-
-  const style = {
-    transform: CSS.Transform.toString(transform),
-    transition,
-    opacity: isDragging ? 0.5 : 1,
-  };
-
-  return (
-    <div ref={setNodeRef} style={style} className="glass rounded-lg p-4 flex items-center gap-4">
-      <div 
-        {...attributes} 
-        {...listeners} 
-        className="cursor-move p-2 text-text-secondary hover:text-text-primary"
-      >
-        <GripVertical className="w-5 h-5" />
-      </div>
-      <div className="flex-1">
-        <h3 className="font-bold">{experience.title}</h3>
-        <p className="text-accent-earth">{experience.company}</p>
-        <p className="text-sm text-text-secondary">
-          {format(new Date(experience.startDate), 'MMM yyyy')} - 
-          {experience.current ? ' Present' : ` ${experience.endDate ? format(new Date(experience.endDate), 'MMM yyyy') : 'N/A'}`}
-        </p>
-      </div>
-      <div className="flex gap-2">
-        <button 
-          onClick={() => onEdit(experience)} 
-          className="p-2 rounded hover:bg-text-primary/10 transition-colors"
-        >
-          <Pencil className="w-4 h-4" />
-        </button>
-        <button 
-          onClick={() => onDelete(experience.id)} 
-          className="p-2 rounded hover:bg-red-500/20 text-red-400 transition-colors"
-        >
-          <Trash2 className="w-4 h-4" />
-        </button>
-      </div>
-    </div>
-  );
-}
-""",
-                "portfolio/components/admin/ImageUpload.tsx": """
-'use client';
-
-import { useState, useCallback } from 'react';
-import { useDropzone } from 'react-dropzone';
-import { Upload, X } from 'lucide-react';
-import Image from 'next/image';
-import { toast } from 'react-hot-toast';
-
 export function ImageUpload({ 
   value, 
   onChange, 
@@ -3706,12 +3464,50 @@ declare module "next-auth/jwt" {
 """,
     }
 
-    # Write all files
-    for path, content in project_files.items():
-        write_file(path, content)
-    
-    # Create the models directory
-    create_directory("portfolio/public/models")
+def render_files():
+    """Returns every generated file keyed by path, exactly as it is written to disk."""
+    return {path: content.strip() for path, content in build_project_files().items()}
+
+def main():
+    """Main function to generate the entire project structure and files."""
+    parser = argparse.ArgumentParser(description="Generate the portfolio project.")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_WORKERS, help="number of parallel file writers")
+    parser.add_argument("--timings", action="store_true", help="print per-file write timings")
+    parser.add_argument("--only", action="append", metavar="PATH",
+                        help="re-emit just this template (relative to portfolio/); may be repeated")
+    parser.add_argument("--archive", choices=ARCHIVE_FORMATS,
+                        help="stream the project to stdout as a reproducible archive instead of writing portfolio/")
+    parser.add_argument("--watch", action="store_true",
+                        help="re-emit templates into portfolio/ as they are edited in this file")
+    args = parser.parse_args()
+
+    if args.only:
+        emit_only(__file__, args.only, workers=args.jobs)
+        return
+
+    if args.watch:
+        watch_templates(__file__, workers=args.jobs)
+        return
+
+    if args.archive:
+        write_archive(render_files(), args.archive, sys.stdout.buffer, ["portfolio/public/models"])
+        return
+
+    if os.path.exists("portfolio"):
+        print("Error: A 'portfolio' directory already exists. Please remove or rename it first.", file=sys.stderr)
+        sys.exit(1)
+
+    print("Generating the complete project structure for 'portfolio'...")
+
+    # Write all files into a staging directory, plus the models directory, then swap it in
+    start = time.perf_counter()
+    try:
+        timings = build_tree(render_files(), "portfolio", ["portfolio/public/models"], workers=args.jobs)
+    except OSError as e:
+        print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.timings:
+        report_timings(timings, time.perf_counter() - start)
         
     print("\n✅ GENESIS PROTOCOL: FUTURISTIC ISOMETRIC ARENA PORTFOLIO COMPLETE")
     print("\n🎯 CORE DIRECTIVES EXECUTED:")
@@ -1,34 +1,24 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
 import base64
+import argparse
+import time
 
-def create_directory(path):
-    """Creates a directory if it doesn't exist."""
-    os.makedirs(path, exist_ok=True)
+from data_tools import DEFAULT_DATA_DIR, PUBLIC_DATA_DIR, publish
+from registry import emit_only, watch_templates
+from scaffold import ARCHIVE_FORMATS, DEFAULT_WORKERS, build_tree, load_options, report_timings, update_tree, write_archive
 
-def write_file(path, content):
-    """Writes content to a file, ensuring the directory exists."""
-    try:
-        dir_name = os.path.dirname(path)
-        if not os.path.exists(dir_name):
-            os.makedirs(dir_name)
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content.strip())
-    except Exception as e:
-        print(f"Error writing file {path}: {e}", file=sys.stderr)
-        sys.exit(1)
-
-def main():
-    """Main function to generate the entire project structure and files."""
-    if os.path.exists("portfolio"):
-        print("Error: A 'portfolio' directory already exists. Please remove or rename it first.", file=sys.stderr)
-        sys.exit(1)
-
-    print("🚀 Generating Futuristic Isometric Arena Portfolio...")
+PROJECTS_PAGES = ("client", "server")
+STORAGE_BACKENDS = ("json", "journal", "sqlite", "sharded")
+# The generated file each option is rendered into (see apply_options)
+OPTION_FILES = {"storage": "portfolio/lib/storage-config.ts", "projects_page": "portfolio/app/projects/page.tsx"}
 
+def build_project_files():
+    """Returns the config, page, API route and 3D scene templates keyed by output path."""
     # --- File Content Dictionary ---
-    project_files = {
+    return {
         # --- Root and Config Files ---
         "portfolio/package.json": """
 {
@@ -39,7 +29,8 @@ def main():
     "dev": "next dev",
     "build": "node scripts/generate-sounds.js && next build",
     "start": "next start",
-    "lint": "next lint"
+    "lint": "next lint",
+    "bench:data": "tsx scripts/bench-data.ts"
   },
   "dependencies": {
     "@dnd-kit/core": "^6.1.0",
@@ -68,8 +59,12 @@ def main():
     "tailwind-merge": "^2.4.0",
     "three": "^0.166.1"
   },
+  "optionalDependencies": {
+    "better-sqlite3": "^11.1.2"
+  },
   "devDependencies": {
     "@tailwindcss/typography": "^0.5.13",
+    "@types/better-sqlite3": "^7.6.11",
     "@types/howler": "^2.2.11",
     "@types/node": "^20",
     "@types/react": "^18",
@@ -80,6 +75,7 @@ def main():
     "eslint-config-next": "14.2.5",
     "postcss": "^8",
     "tailwindcss": "^3.4.0",
+    "tsx": "^4.16.2",
     "typescript": "^5"
   }
 }
@@ -99,6 +95,15 @@ const nextConfig = {
       },
     ],
   },
+  // Published data files (python Code2.py --publish) are named by content hash.
+  async headers() {
+    return [
+      {
+        source: '/data/:file*',
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }],
+      },
+    ];
+  },
 };
 
 module.exports = nextConfig;
@@ -123,6 +128,10 @@ GITHUB_ADMIN_USERNAME=Tahactw
 
 # Formspree Endpoint (for the contact form)
 NEXT_PUBLIC_FORMSPREE_FORM_ID=xanjzakn
+
+# Data storage backend for data/ is set with `python Code2.py --storage` (lib/storage-config.ts);
+# uncomment to override it here (json | journal | sqlite | sharded)
+# DATA_STORAGE=json
 """,
         "portfolio/tailwind.config.js": """
 /** @type {import('tailwindcss').Config} */
@@ -332,6 +341,12 @@ yarn-error.log*
 .env*.local
 .env
 
+# data store temp files
+/data/*.tmp
+/data/*.db-wal
+/data/*.db-shm
+/data/bundles/
+
 # vercel
 .vercel
 
@@ -598,40 +613,44 @@ export default function HomePage() {
         "portfolio/app/projects/page.tsx": """
 'use client';
 
-import { useState, useEffect } from 'react';
-import { ProjectsGrid } from '@/components/ui/ProjectsGrid';
 import { TypewriterHeading } from '@/components/ui/TypewriterHeading';
-import { Project } from '@/lib/data';
-import { motion } from 'framer-motion';
+import { ProjectsBrowser } from '@/components/ui/ProjectsBrowser';
+import type { CategoryPage } from '@/lib/data';
+import categoryIndex from '@/data/category-index.json';
 
-const categories = ['All', 'Mechatronics', 'Video Montage', 'Web Development'];
+// Every category with its count and first page, so switching tabs needs no request.
+// lib/data.ts rewrites it after each project commit (`python data_tools.py
+// category-index` builds it offline); ProjectsBrowser revalidates it on load.
+const { pageSize, categories } = categoryIndex as { pageSize: number; categories: CategoryPage[] };
 
 export default function ProjectsPage() {
-  const [projects, setProjects] = useState<Project[]>([]);
-  const [filteredProjects, setFilteredProjects] = useState<Project[]>([]);
-  const [activeCategory, setActiveCategory] = useState('All');
-  const [loading, setLoading] = useState(true);
+  return (
+    <main className="min-h-screen bg-arena-dark overflow-y-auto scrollable-content">
+      <div className="container mx-auto px-4 py-24">
+        <div className="text-center mb-16">
+          <TypewriterHeading text="PROJECTS" className="mb-4" />
+          <p className="text-xl text-text-secondary max-w-2xl mx-auto animate-fade-in">
+            A collection of my work in engineering and creative development
+          </p>
+        </div>
 
-  useEffect(() => {
-    fetch('/api/data?type=projects')
-      .then(res => res.json())
-      .then(data => {
-        setProjects(data);
-        setFilteredProjects(data);
-        setLoading(false);
-      })
-      .catch(() => setLoading(false));
-  }, []);
+        <ProjectsBrowser categories={categories} pageSize={pageSize} />
+      </div>
+    </main>
+  );
+}
+""",
+        "portfolio/app/projects/page.tsx#server": """
+import { TypewriterHeading } from '@/components/ui/TypewriterHeading';
+import { ProjectsBrowser } from '@/components/ui/ProjectsBrowser';
+import { PAGE_LIMIT, getProjectCategories } from '@/lib/data';
 
-  const handleFilter = (category: string) => {
-    setActiveCategory(category);
-    if (category === 'All') {
-      setFilteredProjects(projects);
-    } else {
-      setFilteredProjects(projects.filter(p => p.category === category));
-    }
-  };
+// Rendered on the server from the live index and regenerated at most once a minute
+// (ISR), so the cards are in the first HTML; the filter bar and grid hydrate as an island.
+export const revalidate = 60;
 
+export default async function ProjectsPage() {
+  const categories = await getProjectCategories();
   return (
     <main className="min-h-screen bg-arena-dark overflow-y-auto scrollable-content">
       <div className="container mx-auto px-4 py-24">
@@ -642,36 +661,7 @@ export default function ProjectsPage() {
           </p>
         </div>
 
-        <motion.div 
-          className="flex justify-center gap-4 mb-12 flex-wrap"
-          initial={{ opacity: 0, y: 20 }}
-          animate={{ opacity: 1, y: 0 }}
-          transition={{ delay: 0.3 }}
-        >
-          {categories.map((category) => (
-            <motion.button
-              key={category}
-              onClick={() => handleFilter(category)}
-              className={`px-6 py-2 rounded-lg border transition-all font-display uppercase tracking-wider ${
-                activeCategory === category
-                  ? 'bg-accent-cyan/20 border-accent-cyan text-accent-cyan'
-                  : 'bg-arena-floor border-arena-border text-text-secondary hover:text-text-primary hover:border-accent-cyan/50'
-              }`}
-              whileHover={{ scale: 1.05 }}
-              whileTap={{ scale: 0.95 }}
-            >
-              {category}
-            </motion.button>
-          ))}
-        </motion.div>
-
-        {loading ? (
-          <div className="text-center py-20">
-            <div className="loading-dots text-text-secondary">Loading projects</div>
-          </div>
-        ) : (
-          <ProjectsGrid projects={filteredProjects} />
-        )}
+        <ProjectsBrowser categories={categories} pageSize={PAGE_LIMIT} live />
       </div>
     </main>
   );
@@ -682,12 +672,17 @@ import { Metadata } from 'next';
 import { notFound } from 'next/navigation';
 import Image from 'next/image';
 import Link from 'next/link';
-import { getProject, getProjects } from '@/lib/data';
+import { cache } from 'react';
+import { getProjectBundle, getProjectIds } from '@/lib/data';
 import { ArrowLeft, ExternalLink, Github, Youtube } from 'lucide-react';
 
+// generateMetadata and the page share one bundle read per request.
+const loadBundle = cache(getProjectBundle);
+
 export async function generateMetadata({ params }: { params: { id: string } }): Promise<Metadata> {
-  const project = await getProject(params.id);
-  if (!project) return { title: 'Project Not Found' };
+  const bundle = await loadBundle(params.id);
+  if (!bundle) return { title: 'Project Not Found' };
+  const { project } = bundle;
   
   return {
     title: `${project.title} | Portfolio`,
@@ -701,34 +696,18 @@ export async function generateMetadata({ params }: { params: { id: string } }):
 }
 
 export async function generateStaticParams() {
-  const projects = await getProjects();
-  return projects.map((project) => ({
-    id: project.id,
-  }));
+  const ids = await getProjectIds();
+  return ids.map((id) => ({ id }));
 }
 
 export default async function ProjectPage({ params }: { params: { id: string } }) {
-  const project = await getProject(params.id);
+  const bundle = await loadBundle(params.id);
   
-  if (!project) {
+  if (!bundle) {
     notFound();
   }
 
-  const projects = await getProjects();
-  const currentIndex = projects.findIndex(p => p.id === project.id);
-  const prevProject = currentIndex > 0 ? projects[currentIndex - 1] : null;
-  const nextProject = currentIndex < projects.length - 1 ? projects[currentIndex + 1] : null;
-
-  const getMediaType = (url: string) => {
-    if (url.includes('youtube.com') || url.includes('youtu.be')) return 'youtube';
-    if (url.endsWith('.gif')) return 'gif';
-    return 'image';
-  };
-
-  const getYouTubeId = (url: string) => {
-    const match = url.match(/(?:youtube\\.com\\/(?:[^\\/]+\\/.+\\/|(?:v|e(?:mbed)?)\\/|.*[?&]v=)|youtu\\.be\\/)([^"&?\\/\\s]{11})/);
-    return match ? match[1] : null;
-  };
+  const { project, prev: prevProject, next: nextProject, media } = bundle;
 
   return (
     <main className="min-h-screen bg-arena-dark overflow-y-auto scrollable-content">
@@ -815,19 +794,16 @@ export default async function ProjectPage({ params }: { params: { id: string } }
             </div>
           </div>
 
-          {project.gallery && project.gallery.length > 0 && (
+          {media.length > 0 && (
             <div className="space-y-8 animate-fade-in">
               <h2 className="font-display">Gallery</h2>
               <div className="grid gap-4">
-                {project.gallery.map((item, index) => {
-                  const mediaType = getMediaType(item.url);
-                  
-                  if (mediaType === 'youtube') {
-                    const videoId = getYouTubeId(item.url);
+                {media.map((item, index) => {
+                  if (item.type === 'youtube') {
                     return (
                       <div key={index} className="relative aspect-video rounded-lg overflow-hidden glass">
                         <iframe
-                          src={`https://www.youtube.com/embed/${videoId}`}
+                          src={`https://www.youtube.com/embed/${item.youtubeId}`}
                           className="w-full h-full"
                           allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
                           allowFullScreen
@@ -836,7 +812,7 @@ export default async function ProjectPage({ params }: { params: { id: string } }
                     );
                   }
                   
-                  if (mediaType === 'gif') {
+                  if (item.type === 'gif') {
                     return (
                       <div key={index} className="relative aspect-video rounded-lg overflow-hidden glass">
                         <img 
@@ -1051,12 +1027,12 @@ export default async function AdminLayout({ children }: { children: React.ReactN
 }
 """,
         "portfolio/app/admin/page.tsx": """
-import { getProjects, getExperiences } from '@/lib/data';
+import { getProjectSummaries, getExperiences } from '@/lib/data';
 import { FolderOpen, Briefcase } from 'lucide-react';
 import Link from 'next/link';
 
 export default async function AdminDashboard() {
-  const projects = await getProjects();
+  const projects = await getProjectSummaries();
   const experiences = await getExperiences();
 
   return (
@@ -1137,7 +1113,8 @@ export default function AdminProjectsPage() {
   const fetchProjects = async () => {
     try { 
       setLoading(true); 
-      const res = await fetch('/api/data?type=projects'); 
+      // Always revalidate: an unchanged list costs a 304, and edits show up at once.
+      const res = await fetch('/api/data?type=projects', { cache: 'no-cache' }); 
       const data = await res.json(); 
       setProjects(data); 
     } 
@@ -1190,15 +1167,13 @@ export default function AdminProjectsPage() {
     setProjects(newProjects);
     
     try {
-      await Promise.all(
-        newProjects.map(p => 
-          fetch('/api/data', { 
-            method: 'PUT', 
-            headers: { 'Content-Type': 'application/json' }, 
-            body: JSON.stringify({ type: 'projects', id: p.id, data: { order: p.order } }) 
-          })
-        )
-      );
+      // One bulk write for the whole new order instead of a PUT per item.
+      const res = await fetch('/api/data', { 
+        method: 'PUT', 
+        headers: { 'Content-Type': 'application/json' }, 
+        body: JSON.stringify({ type: 'projects', action: 'reorder', ids: newProjects.map(p => p.id) }) 
+      });
+      if (!res.ok) throw new Error('Reorder failed');
       toast.success('Order updated');
     } catch (error) { 
       toast.error('Failed to update order'); 
@@ -1329,7 +1304,8 @@ export default function AdminExperiencePage() {
   const fetchExperiences = async () => {
     try { 
       setLoading(true); 
-      const res = await fetch('/api/data?type=experience'); 
+      // Always revalidate: an unchanged list costs a 304, and edits show up at once.
+      const res = await fetch('/api/data?type=experience', { cache: 'no-cache' }); 
       const data = await res.json(); 
       setExperiences(data); 
     }
@@ -1382,15 +1358,13 @@ export default function AdminExperiencePage() {
     setExperiences(newExperiences);
     
     try {
-      await Promise.all(
-        newExperiences.map(e => 
-          fetch('/api/data', { 
-            method: 'PUT', 
-            headers: { 'Content-Type': 'application/json' }, 
-            body: JSON.stringify({ type: 'experience', id: e.id, data: { order: e.order } }) 
-          })
-        )
-      );
+      // One bulk write for the whole new order instead of a PUT per item.
+      const res = await fetch('/api/data', { 
+        method: 'PUT', 
+        headers: { 'Content-Type': 'application/json' }, 
+        body: JSON.stringify({ type: 'experience', action: 'reorder', ids: newExperiences.map(e => e.id) }) 
+      });
+      if (!res.ok) throw new Error('Reorder failed');
       toast.success('Order updated');
     } catch (error) { 
       toast.error('Failed to update order'); 
@@ -1486,12 +1460,14 @@ const handler = NextAuth(authOptions);
 export { handler as GET, handler as POST };
 """,
         "portfolio/app/api/data/route.ts": """
+import { createHash } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
 import { getServerSession } from 'next-auth';
 import { authOptions } from '@/lib/auth';
 import {
-  getProjects, getExperiences, createProject, createExperience,
+  getProjectFields, getProjectPage, getCategoryIndex, getExperienceFields, createProject, createExperience,
   updateProject, updateExperience, deleteProject, deleteExperience,
+  reorderProjects, reorderExperience, applyBatch, InvalidOperation,
 } from '@/lib/data';
 
 async function isAuthorized() {
@@ -1499,13 +1475,81 @@ async function isAuthorized() {
   return session?.user?.login === process.env.GITHUB_ADMIN_USERNAME;
 }
 
+// Browsers revalidate on every use; shared caches may serve a stale copy briefly while
+// they revalidate in the background.
+const CACHE_CONTROL = 'public, max-age=0, stale-while-revalidate=60';
+
+interface Encoded {
+  body: string;
+  etag: string;
+}
+
+// Serialized bodies with a strong ETag (hash of the exact bytes), kept per listing.
+// Listings from lib/data are cached arrays whose identity changes with the data, so a
+// listing is serialized and hashed once per change rather than on every request.
+const encoded = new WeakMap<object, Encoded>();
+
+function encode(value: object): Encoded {
+  let result = encoded.get(value);
+  if (!result) {
+    const body = JSON.stringify(value);
+    result = { body, etag: `"${createHash('sha256').update(body).digest('base64url')}"` };
+    encoded.set(value, result);
+  }
+  return result;
+}
+
+function matches(ifNoneMatch: string | null, etag: string) {
+  if (!ifNoneMatch) return false;
+  return ifNoneMatch.split(',').some(tag => {
+    const value = tag.trim();
+    return value === '*' || value.replace(/^W\\//, '') === etag;
+  });
+}
+
+// 200 with the body, or 304 when the client already holds this version.
+function cachedJson(request: NextRequest, value: object) {
+  const { body, etag } = encode(value);
+  const headers = { ETag: etag, 'Cache-Control': CACHE_CONTROL };
+  if (matches(request.headers.get('if-none-match'), etag)) return new NextResponse(null, { status: 304, headers });
+  return new NextResponse(body, { headers: { ...headers, 'Content-Type': 'application/json' } });
+}
+
 export async function GET(request: NextRequest) {
   const { searchParams } = new URL(request.url);
   const type = searchParams.get('type');
+  // fields=id,title,...: only those fields of each record. Field sets the project index
+  // covers are served from it without loading full records.
+  const fields = searchParams.get('fields')?.split(',').map(field => field.trim()).filter(Boolean);
   try {
-    if (type === 'projects') return NextResponse.json(await getProjects());
-    if (type === 'experience') return NextResponse.json(await getExperiences());
-    return NextResponse.json({ error: 'Invalid type' }, { status: 400 });
+    // category / cursor / limit: one page of projects as { items, total, nextCursor }.
+    if (type === 'projects' && ['category', 'cursor', 'limit'].some(name => searchParams.has(name))) {
+      const cursor = searchParams.get('cursor');
+      const limit = searchParams.get('limit');
+      if ((cursor !== null && !/^-?\\d+$/.test(cursor)) || (limit !== null && !/^\\d+$/.test(limit))) {
+        return NextResponse.json({ error: 'Invalid cursor or limit' }, { status: 400 });
+      }
+      const category = searchParams.get('category');
+      const page = await getProjectPage({
+        category: category && category !== 'All' ? category : null,
+        cursor: cursor === null ? null : Number(cursor),
+        limit: limit === null ? undefined : Number(limit),
+        fields,
+      });
+      if (!page) return NextResponse.json({ error: 'Unknown field' }, { status: 400 });
+      return cachedJson(request, page);
+    }
+
+    // The projects page's filter tabs, shaped like data/category-index.json.
+    if (type === 'categories') return cachedJson(request, await getCategoryIndex());
+
+    let items;
+    if (type === 'projects') items = await getProjectFields(fields);
+    else if (type === 'experience') items = await getExperienceFields(fields);
+    else return NextResponse.json({ error: 'Invalid type' }, { status: 400 });
+
+    if (!items) return NextResponse.json({ error: 'Unknown field' }, { status: 400 });
+    return cachedJson(request, items);
   } catch (error) {
     return NextResponse.json({ error: 'Failed to fetch data' }, { status: 500 });
   }
@@ -1526,7 +1570,14 @@ export async function POST(request: NextRequest) {
 export async function PUT(request: NextRequest) {
   if (!await isAuthorized()) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
   try {
-    const { type, id, data } = await request.json();
+    const { type, id, data, action, ids } = await request.json();
+    if (action === 'reorder') {
+      if (!Array.isArray(ids)) return NextResponse.json({ error: 'ids must be an array' }, { status: 400 });
+      if (type === 'projects') return NextResponse.json(await reorderProjects(ids));
+      if (type === 'experience') return NextResponse.json(await reorderExperience(ids));
+      return NextResponse.json({ error: 'Invalid type' }, { status: 400 });
+    }
+
     let result;
     if (type === 'projects') result = await updateProject(id, data);
     else if (type === 'experience') result = await updateExperience(id, data);
@@ -1554,6 +1605,20 @@ export async function DELETE(request: NextRequest) {
     return NextResponse.json({ error: 'Failed to delete data' }, { status: 500 });
   }
 }
+
+// Batch: { operations: [{ op: 'create' | 'update' | 'delete', type, id?, data? }, ...] }.
+// One session check and one commit per collection for the whole list; a batch with a
+// bad operation is rejected without changing anything.
+export async function PATCH(request: NextRequest) {
+  if (!await isAuthorized()) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 });
+  try {
+    const { operations } = await request.json();
+    return NextResponse.json({ results: await applyBatch(operations) });
+  } catch (error) {
+    if (error instanceof InvalidOperation) return NextResponse.json({ error: error.message }, { status: 400 });
+    return NextResponse.json({ error: 'Failed to apply batch' }, { status: 500 });
+  }
+}
 """,
         "portfolio/app/api/cloudinary/upload/route.ts": """
 import { NextRequest, NextResponse } from 'next/server';
@@ -2174,12 +2239,9 @@ export function LoadingScreen() {
         # Continue in next message due to length...
     }
 
-    # Write all files (Part 1)
-    for path, content in project_files.items():
-        write_file(path, content)
-
-    # Continue with remaining files...
-    remaining_files = {
+def build_remaining_files():
+    """Returns the UI, admin, lib, hook and data templates keyed by output path."""
+    return {
         # --- UI Components ---
         "portfolio/components/ui/DockNavigation.tsx": """
 'use client';
@@ -2378,7 +2440,7 @@ export function TypewriterHeading({ text, className = '' }: { text: string; clas
 'use client';
 
 import { motion, AnimatePresence } from 'framer-motion';
-import { Project } from '@/lib/data';
+import type { ProjectSummary } from '@/lib/data';
 import { ProjectCard } from './ProjectCard';
 
 const container = {
@@ -2391,7 +2453,16 @@ const container = {
   }
 };
 
-export function ProjectsGrid({ projects }: { projects: Project[] }) {
+interface ProjectsGridProps {
+  projects: ProjectSummary[];
+  // Identifies the listing; appending a page keeps the key so loaded cards stay put.
+  filterKey?: string;
+  hasMore?: boolean;
+  loadingMore?: boolean;
+  onLoadMore?: () => void;
+}
+
+export function ProjectsGrid({ projects, filterKey, hasMore = false, loadingMore = false, onLoadMore }: ProjectsGridProps) {
   if (projects.length === 0) {
     return (
       <div className="text-center py-20">
@@ -2401,20 +2472,188 @@ export function ProjectsGrid({ projects }: { projects: Project[] }) {
   }
 
   return (
-    <AnimatePresence mode="wait">
+    <>
+      <AnimatePresence mode="wait">
+        <motion.div 
+          key={filterKey ?? projects.map(p => p.id).join('-')}
+          variants={container}
+          initial="hidden"
+          animate="show"
+          exit={{ opacity: 0 }}
+          className="grid md:grid-cols-2 lg:grid-cols-3 gap-8"
+        >
+          {projects.map((project) => (
+            <ProjectCard key={project.id} project={project} />
+          ))}
+        </motion.div>
+      </AnimatePresence>
+      {hasMore && onLoadMore && (
+        <div className="text-center mt-12">
+          <button
+            onClick={onLoadMore}
+            disabled={loadingMore}
+            className="px-6 py-2 rounded-lg border bg-arena-floor border-arena-border text-text-secondary hover:text-text-primary hover:border-accent-cyan/50 transition-all font-display uppercase tracking-wider disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading' : 'Load more'}
+          </button>
+        </div>
+      )}
+    </>
+  );
+}
+""",
+        "portfolio/components/ui/ProjectsBrowser.tsx": """
+'use client';
+
+import { useState, useCallback, useEffect, useRef } from 'react';
+import { motion } from 'framer-motion';
+import { ProjectsGrid } from './ProjectsGrid';
+import type { CategoryIndex, CategoryPage, ProjectSummary } from '@/lib/data';
+import published from '@/data/published.json';
+
+// Read-only deployments (NEXT_PUBLIC_DATA_MODE=static) never call the API: further
+// pages come from the immutable snapshot written by `python Code2.py --publish`,
+// downloaded once and paged here.
+const staticProjects = process.env.NEXT_PUBLIC_DATA_MODE === 'static'
+  ? (published as { projects?: string }).projects
+  : undefined;
+let staticSnapshot: Promise<ProjectSummary[]> | null = null;
+
+function staticPage(url: string, category: string, cursor: number | null, pageSize: number) {
+  staticSnapshot ??= fetch(url).then(res => res.json()).catch(error => {
+    staticSnapshot = null;
+    throw error;
+  });
+  return staticSnapshot.then(projects => {
+    const members = category === 'All' ? projects : projects.filter(p => p.category === category);
+    const rest = cursor === null ? members : members.filter(p => p.order > cursor);
+    const items = rest.slice(0, pageSize);
+    return { items, nextCursor: rest.length > pageSize ? items[items.length - 1].order : null };
+  });
+}
+
+// One page of the category per request; the server filters and slices.
+function fetchPage(category: string, cursor: number | null, pageSize: number) {
+  if (staticProjects) return staticPage(staticProjects, category, cursor, pageSize);
+  const params = new URLSearchParams({ type: 'projects', fields: 'id,order,category,title,thumbnail,tags', category });
+  if (cursor !== null) params.set('cursor', String(cursor));
+  return fetch(`/api/data?${params}`).then(res => res.json());
+}
+
+// The live tabs, shaped like data/category-index.json (the server answers 304 while
+// they are unchanged).
+function fetchCategories(): Promise<CategoryIndex> {
+  return fetch('/api/data?type=categories').then(res => {
+    if (!res.ok) throw new Error(`Failed to load categories: ${res.status}`);
+    return res.json();
+  });
+}
+
+// What a tab shows, in a fixed shape: data/category-index.json also lists every
+// category's ids and orders card fields its own way, the API does neither.
+const tabsKey = (categories: CategoryPage[]) => JSON.stringify(categories.map(category => [
+  category.name, category.count, category.nextCursor,
+  category.firstPage.map(p => [p.id, p.order, p.category, p.title, p.thumbnail, p.tags]),
+]));
+
+// Filter bar and grid. Every tab arrives with its first page, so switching categories
+// needs no request; only "Load more" fetches. Tabs from the build-time index miss
+// projects added since the build, so outside static mode they are revalidated against
+// the API once on load and replaced if they differ. `live` tabs were just rendered on
+// the server from lib/data and are used as they are.
+export function ProjectsBrowser({ categories: initial, pageSize, live = false }: {
+  categories: CategoryPage[];
+  pageSize: number;
+  live?: boolean;
+}) {
+  const [categories, setCategories] = useState(initial);
+  const [projects, setProjects] = useState<ProjectSummary[]>(initial[0]?.firstPage ?? []);
+  const [nextCursor, setNextCursor] = useState<number | null>(initial[0]?.nextCursor ?? null);
+  const [activeCategory, setActiveCategory] = useState(initial[0]?.name ?? 'All');
+  const [loadingMore, setLoadingMore] = useState(false);
+  const shownCategory = useRef(activeCategory);
+  const pagedFurther = useRef(false); // "Load more" used on the shown tab
+  const view = useRef(0); // bumped whenever the grid is reset to a first page
+
+  useEffect(() => {
+    if (live || staticProjects) return; // static: published together with its index
+    let cancelled = false;
+    fetchCategories()
+      .then(({ categories: fresh }) => {
+        if (cancelled || !fresh.length || tabsKey(fresh) === tabsKey(initial)) return;
+        setCategories(fresh);
+        const shown = fresh.find(category => category.name === shownCategory.current);
+        if (shown && pagedFurther.current) return; // keep the pages already loaded
+        const tab = shown ?? fresh[0];
+        shownCategory.current = tab.name;
+        pagedFurther.current = false;
+        view.current++;
+        setActiveCategory(tab.name);
+        setProjects(tab.firstPage);
+        setNextCursor(tab.nextCursor);
+      })
+      .catch(() => {});
+    return () => { cancelled = true; };
+  }, [initial, live]);
+
+  const loadMore = useCallback(() => {
+    if (nextCursor === null || loadingMore) return;
+    setLoadingMore(true);
+    const started = view.current;
+    fetchPage(activeCategory, nextCursor, pageSize)
+      .then(page => {
+        if (view.current !== started) return; // switched tabs or revalidated meanwhile
+        pagedFurther.current = true;
+        setProjects(current => [...current, ...page.items]);
+        setNextCursor(page.nextCursor);
+      })
+      .catch(() => {})
+      .finally(() => setLoadingMore(false));
+  }, [activeCategory, nextCursor, loadingMore, pageSize]);
+
+  const handleFilter = (category: CategoryPage) => {
+    shownCategory.current = category.name;
+    pagedFurther.current = false;
+    view.current++;
+    setActiveCategory(category.name);
+    setProjects(category.firstPage);
+    setNextCursor(category.nextCursor);
+  };
+
+  return (
+    <>
       <motion.div 
-        key={projects.map(p => p.id).join('-')}
-        variants={container}
-        initial="hidden"
-        animate="show"
-        exit={{ opacity: 0 }}
-        className="grid md:grid-cols-2 lg:grid-cols-3 gap-8"
+        className="flex justify-center gap-4 mb-12 flex-wrap"
+        initial={{ opacity: 0, y: 20 }}
+        animate={{ opacity: 1, y: 0 }}
+        transition={{ delay: 0.3 }}
       >
-        {projects.map((project) => (
-          <ProjectCard key={project.id} project={project} />
+        {categories.map((category) => (
+          <motion.button
+            key={category.name}
+            onClick={() => handleFilter(category)}
+            className={`px-6 py-2 rounded-lg border transition-all font-display uppercase tracking-wider ${
+              activeCategory === category.name
+                ? 'bg-accent-cyan/20 border-accent-cyan text-accent-cyan'
+                : 'bg-arena-floor border-arena-border text-text-secondary hover:text-text-primary hover:border-accent-cyan/50'
+            }`}
+            whileHover={{ scale: 1.05 }}
+            whileTap={{ scale: 0.95 }}
+          >
+            {category.name}
+            <span className="ml-2 text-sm opacity-60">{category.count}</span>
+          </motion.button>
         ))}
       </motion.div>
-    </AnimatePresence>
+
+      <ProjectsGrid
+        projects={projects}
+        filterKey={activeCategory}
+        hasMore={nextCursor !== null}
+        loadingMore={loadingMore}
+        onLoadMore={loadMore}
+      />
+    </>
   );
 }
 """,
@@ -2423,7 +2662,7 @@ export function ProjectsGrid({ projects }: { projects: Project[] }) {
 
 import Image from 'next/image';
 import Link from 'next/link';
-import { Project } from '@/lib/data';
+import type { ProjectSummary } from '@/lib/data';
 import { motion } from 'framer-motion';
 import { ArrowUpRight } from 'lucide-react';
 import { useState } from 'react';
@@ -2433,7 +2672,7 @@ const item = {
   show: { y: 0, opacity: 1 }
 };
 
-export function ProjectCard({ project }: { project: Project }) {
+export function ProjectCard({ project }: { project: ProjectSummary }) {
   const [imageLoaded, setImageLoaded] = useState(false);
   const isGif = project.thumbnail.endsWith('.gif');
 
@@ -3611,13 +3850,20 @@ export const authOptions: NextAuthOptions = {
 };
 """,
         "portfolio/lib/data.ts": """
-import fs from 'fs/promises';
+import { createHash } from 'crypto';
+import { watch, FSWatcher } from 'fs';
 import path from 'path';
 import { nanoid } from 'nanoid';
+import {
+  Collection, SCHEMA_VERSION, dataDir, listBundles, openCollection, readBundle, readBundleVersion, writeBundles,
+  writeBundleVersion, writeCategoryIndex,
+} from './storage';
 
-const dataDir = path.join(process.cwd(), 'data');
-const projectsPath = path.join(dataDir, 'projects.json');
-const experiencePath = path.join(dataDir, 'experience.json');
+// The fields project cards render; listings read only these.
+const projectSummaryFields = ['id', 'order', 'category', 'title', 'thumbnail', 'tags'] as const;
+
+const projectsStore = openCollection<Project>('projects', [...projectSummaryFields]);
+const experienceStore = openCollection<Experience>('experience');
 
 export interface GalleryItem {
   id: string;
@@ -3642,6 +3888,8 @@ export interface Project {
   images?: string[];
 }
 
+export type ProjectSummary = Pick<Project, typeof projectSummaryFields[number]>;
+
 export interface Experience {
   id: string; 
   title: string; 
@@ -3656,135 +3904,1203 @@ export interface Experience {
   updatedAt: string;
 }
 
-async function readDataFile<T>(filePath: string, defaultData: { [key: string]: T[] }): Promise<{ [key: string]: T[] }> {
+// Every field a listing may request with `fields=`.
+const projectFields: (keyof Project)[] = [
+  'id', 'title', 'description', 'category', 'thumbnail', 'gallery', 'tags', 'links', 'order', 'createdAt', 'updatedAt',
+];
+const experienceFields: (keyof Experience)[] = [
+  'id', 'title', 'company', 'description', 'startDate', 'endDate', 'current', 'skills', 'order', 'createdAt', 'updatedAt',
+];
+
+// --- Process-wide snapshot cache ---
+// Each collection is loaded once into a snapshot holding the records pre-sorted by
+// `order` and an id -> record Map. A snapshot is reused until the collection's stamp
+// (see lib/storage.ts) changes. While an fs.watch on the data directory is up, reads
+// skip the stamp check until the watcher reports one of the collection's files, and our
+// own writes install the new snapshot directly so they are not re-read. Backends with
+// a separate index get a second, much smaller cache of index entries for listings.
+// Snapshots are shared, so callers must not mutate them.
+
+interface Cached {
+  stamp: string;
+  // Watcher generation of the collection's files when the stamp was last confirmed.
+  checked: number;
+}
+
+interface Snapshot<T> extends Cached {
+  items: T[];
+  byId: Map<string, T>;
+}
+
+interface IndexSnapshot<T> extends Cached {
+  entries: Partial<T>[];
+}
+
+const snapshots = new Map<string, Snapshot<any>>();
+const indexes = new Map<string, IndexSnapshot<any>>();
+const summaries = new WeakMap<Snapshot<any>, any[]>();
+const generations = new Map<string, number>();
+let watcher: FSWatcher | null = null;
+
+function watchDataDir() {
+  if (watcher) return;
   try {
-    await fs.access(filePath);
-    const data = JSON.parse(await fs.readFile(filePath, 'utf-8'));
-    
-    // Migrate old projects format
-    if (filePath === projectsPath && data.projects) {
-      data.projects = data.projects.map((p: any) => {
-        if (p.images && !p.gallery) {
-          p.gallery = p.images.map((url: string) => ({
-            id: nanoid(),
-            url,
-            type: url.endsWith('.gif') ? 'gif' : 'image'
-          }));
-        }
-        return p;
+    watcher = watch(dataDir, (_event, filename) => {
+      if (filename) {
+        const file = path.join(dataDir, filename.toString());
+        generations.set(file, (generations.get(file) ?? 0) + 1);
+      } else {
+        snapshots.clear();
+        indexes.clear();
+      }
+    });
+    watcher.on('error', () => {
+      watcher?.close();
+      watcher = null;
+      snapshots.clear();
+      indexes.clear();
+    });
+    watcher.unref();
+  } catch {
+    watcher = null; // Fall back to the mtime check on every read.
+  }
+}
+
+function migrateProject(p: any): Project {
+  // Migrate old projects format. Only files older than SCHEMA_VERSION get here; gallery
+  // ids derive from the project id so they are the same on every read.
+  if (p.images && !p.gallery) {
+    p.gallery = p.images.map((url: string, index: number) => ({
+      id: `${p.id}-${index}`,
+      url,
+      type: url.includes('youtube.com') || url.includes('youtu.be') ? 'youtube' :
+            url.endsWith('.gif') ? 'gif' : 'image'
+    }));
+  }
+  return p;
+}
+
+const generation = <T>(store: Collection<T>) =>
+  store.files.reduce((sum, file) => sum + (generations.get(file) ?? 0), 0);
+
+// Whether a cache entry still reflects storage: free while the watcher has reported no
+// change to the collection's files, one stamp check otherwise.
+async function isCurrent<T>(store: Collection<T>, cached: Cached) {
+  const seen = generation(store);
+  if (watcher && cached.checked === seen) return true;
+  if (cached.stamp !== await store.stamp()) return false;
+  cached.checked = seen;
+  return true;
+}
+
+async function loadSnapshot<T extends { id: string; order: number }>(
+  store: Collection<T>,
+  migrate?: (record: any) => T,
+): Promise<Snapshot<T>> {
+  const cached = snapshots.get(store.name);
+  if (cached && await isCurrent(store, cached)) return cached;
+
+  const checked = generation(store);
+  const { stamp, records, schemaVersion } = await store.load();
+  const snapshot = makeSnapshot(stamp, checked, migrate && schemaVersion < SCHEMA_VERSION ? records.map(migrate) : records);
+  snapshots.set(store.name, snapshot);
+  watchDataDir();
+  return snapshot;
+}
+
+function makeSnapshot<T extends { id: string; order: number }>(stamp: string, checked: number, records: T[]): Snapshot<T> {
+  const items = [...records].sort((a, b) => a.order - b.order);
+  return { stamp, checked, items, byId: new Map(items.map(item => [item.id, item] as [string, T])) };
+}
+
+// Index entries of a collection, from the backend's index when it keeps one and
+// otherwise derived once per snapshot.
+async function loadIndex<T extends { id: string; order: number }, S>(
+  store: Collection<T>,
+  load: () => Promise<Snapshot<T>>,
+  summarize: (record: T) => S,
+): Promise<S[]> {
+  if (!store.index) {
+    const snapshot = await load();
+    if (!summaries.has(snapshot)) summaries.set(snapshot, snapshot.items.map(summarize));
+    return summaries.get(snapshot)!;
+  }
+
+  const cached = indexes.get(store.name);
+  if (cached && await isCurrent(store, cached)) return cached.entries as S[];
+
+  const checked = generation(store);
+  const { stamp, entries } = await store.index();
+  indexes.set(store.name, { stamp, checked, entries });
+  watchDataDir();
+  return entries as unknown as S[];
+}
+
+// A single record, read on its own when the backend supports it and no current
+// snapshot is cached.
+async function loadRecord<T extends { id: string; order: number }>(
+  store: Collection<T>,
+  load: () => Promise<Snapshot<T>>,
+  id: string,
+): Promise<T | null> {
+  const cached = snapshots.get(store.name);
+  if (store.record && !(cached && await isCurrent(store, cached))) return store.record(id);
+  return (await load()).byId.get(id) || null;
+}
+
+// --- Group-committed writes ---
+// Mutations never touch storage directly. Each one is queued per collection as a
+// function from the current records to the next ones; when the commit window closes,
+// the queued mutations are applied in arrival order and persisted with a single
+// backend write. Batches for a collection run strictly one after another, so
+// concurrent requests can no longer overwrite each other's changes. An `onCommit`
+// hook updates files derived from the records before the mutations resolve.
+
+const COMMIT_WINDOW_MS = 5;
+
+type Mutation<T, R> = (records: T[]) => { records: T[]; result: R };
+
+// Called with the records (sorted by order) before and after a commit.
+type CommitHook<T> = (previous: T[], next: T[]) => Promise<void>;
+
+interface Pending<T> {
+  mutation: Mutation<T, any>;
+  resolve: (result: any) => void;
+  reject: (error: unknown) => void;
+}
+
+interface WriteQueue<T> {
+  pending: Pending<T>[];
+  timer: NodeJS.Timeout | null;
+  tail: Promise<void>;
+}
+
+const queues = new Map<string, WriteQueue<any>>();
+
+async function commit<T extends { id: string; order: number }>(
+  store: Collection<T>,
+  load: () => Promise<Snapshot<T>>,
+  batch: Pending<T>[],
+  onCommit?: CommitHook<T>,
+) {
+  let initial: T[];
+  try {
+    initial = (await load()).items;
+  } catch (error) {
+    batch.forEach(p => p.reject(error));
+    return;
+  }
+
+  let records = initial;
+  const applied: { pending: Pending<T>; result: any }[] = [];
+  for (const pending of batch) {
+    try {
+      const next = pending.mutation(records);
+      records = next.records;
+      applied.push({ pending, result: next.result });
+    } catch (error) {
+      pending.reject(error);
+    }
+  }
+
+  try {
+    if (records !== initial) {
+      const snapshot = await persistSnapshot(store, initial, records);
+      await onCommit?.(initial, snapshot.items);
+    }
+    applied.forEach(({ pending, result }) => pending.resolve(result));
+  } catch (error) {
+    applied.forEach(({ pending }) => pending.reject(error));
+  }
+}
+
+// Writes the records and makes them the cached snapshot.
+async function persistSnapshot<T extends { id: string; order: number }>(
+  store: Collection<T>,
+  previous: T[],
+  records: T[],
+): Promise<Snapshot<T>> {
+  const stamp = await store.persist(previous, records);
+  const snapshot = makeSnapshot(stamp, generation(store), records);
+  snapshots.set(store.name, snapshot);
+  indexes.delete(store.name);
+  return snapshot;
+}
+
+function queueOf<T>(store: Collection<T>): WriteQueue<T> {
+  let queue: WriteQueue<T> | undefined = queues.get(store.name);
+  if (!queue) {
+    queue = { pending: [], timer: null, tail: Promise.resolve() };
+    queues.set(store.name, queue);
+  }
+  return queue;
+}
+
+function enqueue<T extends { id: string; order: number }, R>(
+  store: Collection<T>,
+  load: () => Promise<Snapshot<T>>,
+  mutation: Mutation<T, R>,
+  onCommit?: CommitHook<T>,
+): Promise<R> {
+  const q = queueOf(store);
+  return new Promise<R>((resolve, reject) => {
+    q.pending.push({ mutation, resolve, reject });
+    if (q.timer) return;
+    q.timer = setTimeout(() => {
+      q.timer = null;
+      const batch = q.pending.splice(0);
+      q.tail = q.tail.then(() => commit(store, load, batch, onCommit));
+    }, COMMIT_WINDOW_MS);
+  });
+}
+
+// One collection's part of a commit spanning several collections.
+interface Change<T> {
+  store: Collection<T>;
+  load: () => Promise<Snapshot<T>>;
+  mutation: Mutation<T, any>;
+  onCommit?: CommitHook<T>;
+}
+
+// Commits one mutation per collection as a unit, after every batch already queued for
+// those collections and before any later one. The mutations run against the current
+// records, so if one throws (say a record was deleted meanwhile) nothing is written;
+// if a write fails, the collections already written are restored.
+function commitTogether(changes: Change<any>[]): Promise<any[]> {
+  const held = changes.map(change => queueOf(change.store));
+  const run = Promise.all(held.map(q => q.tail)).then(() => applyChanges(changes));
+  const done = run.then(() => {}, () => {});
+  held.forEach(q => { q.tail = done; });
+  return run;
+}
+
+async function applyChanges(changes: Change<any>[]): Promise<any[]> {
+  const initial = await Promise.all(changes.map(change => change.load().then(snapshot => snapshot.items)));
+  const next = changes.map((change, i) => change.mutation(initial[i]));
+  const written: { index: number; snapshot: Snapshot<any> }[] = [];
+  try {
+    for (let index = 0; index < changes.length; index++) {
+      if (next[index].records === initial[index]) continue;
+      written.push({ index, snapshot: await persistSnapshot(changes[index].store, initial[index], next[index].records) });
+    }
+  } catch (error) {
+    for (const { index, snapshot } of written.reverse()) {
+      const { store } = changes[index];
+      await persistSnapshot(store, snapshot.items, initial[index]).catch(undo => {
+        snapshots.delete(store.name);
+        console.error(`Failed to restore ${store.name} after a failed batch`, undo);
       });
     }
-    
-    return data;
-  } catch {
-    await fs.mkdir(dataDir, { recursive: true });
-    await fs.writeFile(filePath, JSON.stringify(defaultData, null, 2));
-    return defaultData;
+    throw error;
   }
+  for (const { index, snapshot } of written) await changes[index].onCommit?.(initial[index], snapshot.items);
+  return next.map(({ result }) => result);
+}
+
+const projectsSnapshot = () => loadSnapshot(projectsStore, migrateProject);
+const experienceSnapshot = () => loadSnapshot(experienceStore);
+
+const mutateProjects = <R>(mutation: Mutation<Project, R>) =>
+  enqueue(projectsStore, projectsSnapshot, mutation, updateProjectFiles);
+const mutateExperience = <R>(mutation: Mutation<Experience, R>) => enqueue(experienceStore, experienceSnapshot, mutation);
+
+// Applies a complete ordering. Records missing from `ids` (e.g. created while the
+// admin was dragging) keep their relative order after the listed ones.
+function applyOrder<T extends { id: string; order: number }>(records: T[], ids: string[]): T[] {
+  const byId = new Map(records.map(item => [item.id, item] as [string, T]));
+  const listed = new Set<string>();
+  const ordered: T[] = [];
+  for (const id of ids) {
+    const item = byId.get(id);
+    if (item && !listed.has(id)) {
+      listed.add(id);
+      ordered.push(item);
+    }
+  }
+  for (const item of records) {
+    if (!listed.has(item.id)) ordered.push(item);
+  }
+  return ordered.map((item, order) => item.order === order ? item : { ...item, order });
+}
+
+function updateRecord<T extends { id: string; updatedAt: string }>(records: T[], id: string, updates: Partial<T>) {
+  const index = records.findIndex(r => r.id === id);
+  if (index < 0) return { records, result: null };
+  const updated: T = { ...records[index], ...updates, updatedAt: new Date().toISOString() };
+  return { records: records.map((r, i) => i === index ? updated : r), result: updated };
+}
+
+function deleteRecord<T extends { id: string; order: number }>(records: T[], id: string) {
+  if (!records.some(r => r.id === id)) return { records, result: false };
+  const remaining = records.filter(r => r.id !== id).map((r, i) => r.order === i ? r : { ...r, order: i });
+  return { records: remaining, result: true };
 }
 
 const getProjects = async (): Promise<Project[]> => {
-  const data = await readDataFile<Project>(projectsPath, { projects: [] });
-  return data.projects.sort((a, b) => a.order - b.order);
+  const { items } = await projectsSnapshot();
+  return [...items];
+};
+
+const getProject = (id: string): Promise<Project | null> => loadRecord(projectsStore, projectsSnapshot, id);
+
+const summarizeProject = (p: Project): ProjectSummary =>
+  ({ id: p.id, order: p.order, category: p.category, title: p.title, thumbnail: p.thumbnail, tags: p.tags });
+
+const getProjectSummaries = (): Promise<ProjectSummary[]> =>
+  loadIndex(projectsStore, projectsSnapshot, summarizeProject);
+
+// --- Project page bundles ---
+// A project page renders from one compact bundle: the record, its neighbours for the
+// prev/next links, and its gallery with media types and YouTube ids worked out. Each
+// commit rewrites only the bundles whose record or neighbours changed;
+// `python data_tools.py bundles` builds them all (keep makeBundle in step with it).
+// Bundles are used only while their recorded version matches the live records, so
+// external edits, offline migrations and a switch of DATA_STORAGE fall back to the
+// snapshot until the next commit rebuilds them.
+
+export interface ProjectLink {
+  id: string;
+  title: string;
+}
+
+export interface MediaItem extends GalleryItem {
+  youtubeId: string | null;
+}
+
+export interface ProjectBundle {
+  project: Project;
+  prev: ProjectLink | null;
+  next: ProjectLink | null;
+  media: MediaItem[];
+}
+
+const YOUTUBE_ID = /(?:youtube\\.com\\/(?:[^\\/]+\\/.+\\/|(?:v|e(?:mbed)?)\\/|.*[?&]v=)|youtu\\.be\\/)([^"&?\\/\\s]{11})/;
+
+function mediaType(url: string): GalleryItem['type'] {
+  if (url.includes('youtube.com') || url.includes('youtu.be')) return 'youtube';
+  return url.endsWith('.gif') ? 'gif' : 'image';
+}
+
+const linkTo = (p: Project | undefined): ProjectLink | null => p ? { id: p.id, title: p.title } : null;
+
+function makeBundle(projects: Project[], index: number): ProjectBundle {
+  const project = projects[index];
+  const media = (project.gallery || []).map(item => {
+    const type = mediaType(item.url);
+    return { ...item, type, youtubeId: type === 'youtube' ? item.url.match(YOUTUBE_ID)?.[1] ?? null : null };
+  });
+  return { project, prev: linkTo(projects[index - 1]), next: linkTo(projects[index + 1]), media };
+}
+
+const sameLink = (a: Project | undefined, b: Project | undefined) => a?.id === b?.id && a?.title === b?.title;
+
+const versions = new WeakMap<object[], string>();
+
+// A digest of records sorted by order, the same for the same data in any process and
+// backend; `python data_tools.py bundles` computes it the same way.
+function recordsVersion(items: object[]): string {
+  let version = versions.get(items);
+  if (!version) versions.set(items, version = createHash('sha256').update(JSON.stringify(items)).digest('hex'));
+  return version;
+}
+
+async function updateProjectBundles(previous: Project[], next: Project[]) {
+  try {
+    // Bundles built from other records than `previous` are rebuilt rather than patched.
+    const current = await readBundleVersion('projects') === recordsVersion(previous);
+    const before = new Map(previous.map((p, i) => [p.id, i] as [string, number]));
+    const put: { id: string; bundle: ProjectBundle }[] = [];
+    next.forEach((project, i) => {
+      const j = before.get(project.id);
+      // Unchanged records keep their identity across commits (see updateRecord).
+      if (current && j !== undefined && previous[j] === project &&
+          sameLink(previous[j - 1], next[i - 1]) && sameLink(previous[j + 1], next[i + 1])) return;
+      put.push({ id: project.id, bundle: makeBundle(next, i) });
+    });
+    const remaining = new Set(next.map(p => p.id));
+    const del = (current ? previous.map(p => p.id) : await listBundles('projects')).filter(id => !remaining.has(id));
+    await writeBundleVersion('projects', null);
+    await writeBundles('projects', put, del);
+    await writeBundleVersion('projects', recordsVersion(next));
+  } catch (error) {
+    // The records are already committed; without a current version pages use the snapshot.
+    console.error('Failed to update project bundles', error);
+    await writeBundleVersion('projects', null).catch(() => {});
+  }
+}
+
+// The page bundle of a project: one small file read while the bundles match the live
+// records, otherwise built from the snapshot.
+const getProjectBundle = async (id: string): Promise<ProjectBundle | null> => {
+  const { items, byId } = await projectsSnapshot();
+  if (await readBundleVersion('projects') === recordsVersion(items)) {
+    const bundle = await readBundle<ProjectBundle>('projects', id);
+    if (bundle) return bundle;
+  }
+  const project = byId.get(id);
+  return project ? makeBundle(items, items.indexOf(project)) : null;
+};
+
+// Project ids in order, from the index alone.
+const getProjectIds = async (): Promise<string[]> => (await getProjectSummaries()).map(p => p.id);
+
+// --- Field projection ---
+// Listings ask for just the fields they render. A projection is memoized per cached
+// item array (snapshot or index) and field set, so repeated requests are free until
+// the data changes; field sets the index covers never load full records. Without
+// `fields` the cached snapshot array itself is returned. Either way the result is
+// shared and keeps its identity until the data changes.
+
+const projections = new WeakMap<object[], Map<string, object[]>>();
+
+function projectItems<T extends object>(items: T[], fields: (keyof T)[]): Partial<T>[] {
+  let byFields = projections.get(items);
+  if (!byFields) projections.set(items, byFields = new Map());
+  const key = fields.join(',');
+  let projected = byFields.get(key) as Partial<T>[] | undefined;
+  if (!projected) {
+    projected = items.map(item =>
+      Object.fromEntries(fields.filter(field => field in item).map(field => [field, item[field]])) as Partial<T>);
+    byFields.set(key, projected);
+  }
+  return projected;
+}
+
+// The requested fields sorted and de-duplicated, or null if any is unknown.
+function normalizeFields<T>(fields: string[], known: (keyof T)[]): (keyof T)[] | null {
+  const unique = Array.from(new Set(fields)).sort();
+  return unique.every(field => (known as string[]).includes(field)) ? unique as (keyof T)[] : null;
+}
+
+const getProjectFields = async (fields?: string[]): Promise<Partial<Project>[] | null> => {
+  if (!fields) return (await projectsSnapshot()).items;
+  const wanted = normalizeFields<Project>(fields, projectFields);
+  if (!wanted) return null;
+  const fromIndex = wanted.every(field => (projectSummaryFields as readonly string[]).includes(field));
+  const items: Partial<Project>[] = fromIndex ? await getProjectSummaries() : (await projectsSnapshot()).items;
+  return projectItems(items, wanted);
+};
+
+// --- Category pages ---
+// Listings page through one category at a time. The category -> records index is built
+// once per cached item array, like projections, so a page is a binary search and a
+// slice. The cursor is the `order` of the last record on the previous page. Pages are
+// kept per item array too, so the same request returns the same object until the data
+// changes (the API route serializes and hashes each object once).
+
+const PAGE_LIMIT = 12;
+const MAX_PAGE_LIMIT = 100;
+const MAX_CACHED_PAGES = 256; // per item array; cursors and limits come from clients
+
+export interface Page<T> {
+  items: T[];
+  total: number;
+  nextCursor: number | null;
+}
+
+// A filter tab: the category's size and first page of cards.
+export interface CategoryPage {
+  name: string;
+  count: number;
+  firstPage: ProjectSummary[];
+  nextCursor: number | null;
+}
+
+const categoryIndexes = new WeakMap<object[], Map<string, object[]>>();
+
+function byCategory<T extends { category?: string }>(items: T[]): Map<string, T[]> {
+  let index = categoryIndexes.get(items) as Map<string, T[]> | undefined;
+  if (!index) {
+    index = new Map();
+    for (const item of items) {
+      const category = item.category ?? '';
+      let members = index.get(category);
+      if (!members) index.set(category, members = []);
+      members.push(item);
+    }
+    categoryIndexes.set(items, index);
+  }
+  return index;
+}
+
+const pages = new WeakMap<object[], Map<string, Page<object>>>();
+const noItems: never[] = [];
+
+function pageOf<T extends { order?: number }>(items: T[], cursor: number | null, limit: number): Page<T> {
+  let cached = pages.get(items) as Map<string, Page<T>> | undefined;
+  if (!cached) pages.set(items, cached = new Map());
+  const key = `${cursor}:${limit}`;
+  let result = cached.get(key);
+  if (!result) {
+    let lo = 0, hi = items.length;
+    if (cursor !== null) {
+      while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if ((items[mid].order ?? 0) <= cursor) lo = mid + 1;
+        else hi = mid;
+      }
+    }
+    const page = items.slice(lo, lo + limit);
+    const more = lo + limit < items.length;
+    result = { items: page, total: items.length, nextCursor: more ? page[page.length - 1].order ?? null : null };
+    if (cached.size >= MAX_CACHED_PAGES) cached.clear();
+    cached.set(key, result);
+  }
+  return result;
+}
+
+// One page of projects in `category` (all projects if null), or null if a field is
+// unknown. `order` is always included so the client can follow the cursor.
+const getProjectPage = async ({ category = null, cursor = null, limit = PAGE_LIMIT, fields }: {
+  category?: string | null;
+  cursor?: number | null;
+  limit?: number;
+  fields?: string[];
+}): Promise<Page<Partial<Project>> | null> => {
+  const wanted = fields ? normalizeFields<Project>([...fields, 'order'], projectFields) : projectFields;
+  if (!wanted) return null;
+  const fromIndex = wanted.every(field => (projectSummaryFields as readonly string[]).includes(field));
+  const all: Partial<Project>[] = fromIndex ? await getProjectSummaries() : (await projectsSnapshot()).items;
+  const members = category === null ? all : byCategory(all).get(category) ?? noItems;
+  return pageOf(fields ? projectItems(members, wanted) : members, cursor, Math.min(Math.max(limit, 1), MAX_PAGE_LIMIT));
+};
+
+const categoryGroups = (summaries: ProjectSummary[]): [string, ProjectSummary[]][] => [
+  ['All', summaries],
+  ...Array.from(byCategory(summaries)).filter(([name]) => name).sort(([a], [b]) => a < b ? -1 : 1),
+];
+
+const categoryPages = new WeakMap<object[], CategoryPage[]>();
+
+// "All" followed by every category, each with its first page; the same shape
+// data/category-index.json has, built from the live index instead. Kept per index
+// array, so repeated calls return the same tabs until the projects change.
+const getProjectCategories = async (): Promise<CategoryPage[]> => {
+  const summaries = await getProjectSummaries();
+  let categories = categoryPages.get(summaries);
+  if (!categories) {
+    categories = categoryGroups(summaries).map(([name, members]) => {
+      const page = pageOf(members, null, PAGE_LIMIT);
+      return { name, count: page.total, firstPage: page.items, nextCursor: page.nextCursor };
+    });
+    categoryPages.set(summaries, categories);
+  }
+  return categories;
 };
 
-const getProject = async (id: string): Promise<Project | null> => {
-  const projects = await getProjects();
-  return projects.find(p => p.id === id) || null;
+export interface CategoryIndex {
+  pageSize: number;
+  categories: CategoryPage[];
+}
+
+const tabIndexes = new WeakMap<CategoryPage[], CategoryIndex>();
+
+// The tabs with their page size, as the projects page imports them from
+// data/category-index.json; the same object until the projects change.
+const getCategoryIndex = async (): Promise<CategoryIndex> => {
+  const categories = await getProjectCategories();
+  let index = tabIndexes.get(categories);
+  if (!index) tabIndexes.set(categories, index = { pageSize: PAGE_LIMIT, categories });
+  return index;
 };
 
-const createProject = async (data: Omit<Project, 'id' | 'createdAt' | 'updatedAt' | 'order'>): Promise<Project> => {
-  const fileData = await readDataFile<Project>(projectsPath, { projects: [] });
+// Rewrites data/category-index.json as `python data_tools.py category-index` would, so
+// `next dev` and the next build list new projects without running it by hand.
+async function updateCategoryIndex() {
+  try {
+    const categories = categoryGroups(await getProjectSummaries()).map(([name, members]) => {
+      const page = pageOf(members, null, PAGE_LIMIT);
+      return { name, count: page.total, ids: members.map(p => p.id), firstPage: page.items, nextCursor: page.nextCursor };
+    });
+    await writeCategoryIndex({ pageSize: PAGE_LIMIT, categories });
+  } catch (error) {
+    // The records are already committed; the projects page revalidates its tabs on load.
+    console.error('Failed to update the category index', error);
+  }
+}
+
+// Commit hook for projects: the files derived from them besides the storage itself.
+async function updateProjectFiles(previous: Project[], next: Project[]) {
+  await updateProjectBundles(previous, next);
+  await updateCategoryIndex();
+}
+
+function insertProject(records: Project[], data: Omit<Project, 'id' | 'createdAt' | 'updatedAt' | 'order'>) {
   const newProject: Project = { 
     ...data, 
     id: nanoid(), 
-    order: fileData.projects.length, 
+    order: records.length, 
     createdAt: new Date().toISOString(), 
     updatedAt: new Date().toISOString() 
   };
-  fileData.projects.push(newProject);
-  await fs.writeFile(projectsPath, JSON.stringify(fileData, null, 2));
-  return newProject;
-};
+  return { records: [...records, newProject], result: newProject };
+}
 
-const updateProject = async (id: string, updates: Partial<Project>): Promise<Project | null> => {
-  const fileData = await readDataFile<Project>(projectsPath, { projects: [] });
-  const index = fileData.projects.findIndex(p => p.id === id);
-  if (index === -1) return null;
-  
-  fileData.projects[index] = { 
-    ...fileData.projects[index], 
-    ...updates, 
-    updatedAt: new Date().toISOString() 
-  };
-  await fs.writeFile(projectsPath, JSON.stringify(fileData, null, 2));
-  return fileData.projects[index];
-};
+const createProject = (data: Omit<Project, 'id' | 'createdAt' | 'updatedAt' | 'order'>): Promise<Project> =>
+  mutateProjects(records => insertProject(records, data));
 
-const deleteProject = async (id: string): Promise<boolean> => {
-  const fileData = await readDataFile<Project>(projectsPath, { projects: [] });
-  const filtered = fileData.projects.filter(p => p.id !== id);
-  if (filtered.length === fileData.projects.length) return false;
-  
-  fileData.projects = filtered.map((p, i) => ({ ...p, order: i }));
-  await fs.writeFile(projectsPath, JSON.stringify(fileData, null, 2));
-  return true;
-};
+const updateProject = (id: string, updates: Partial<Project>): Promise<Project | null> =>
+  mutateProjects(records => updateRecord(records, id, updates));
+
+const deleteProject = (id: string): Promise<boolean> =>
+  mutateProjects(records => deleteRecord(records, id));
+
+const reorderProjects = (ids: string[]): Promise<Project[]> =>
+  mutateProjects(records => {
+    const reordered = applyOrder(records, ids);
+    return { records: reordered, result: reordered };
+  });
 
 const getExperiences = async (): Promise<Experience[]> => {
-  const data = await readDataFile<Experience>(experiencePath, { experience: [] });
-  return data.experience.sort((a, b) => a.order - b.order);
+  const { items } = await experienceSnapshot();
+  return [...items];
 };
 
-const createExperience = async (data: Omit<Experience, 'id' | 'createdAt' | 'updatedAt' | 'order'>): Promise<Experience> => {
-  const fileData = await readDataFile<Experience>(experiencePath, { experience: [] });
+const getExperienceFields = async (fields?: string[]): Promise<Partial<Experience>[] | null> => {
+  if (!fields) return (await experienceSnapshot()).items;
+  const wanted = normalizeFields<Experience>(fields, experienceFields);
+  return wanted && projectItems((await experienceSnapshot()).items, wanted);
+};
+
+function insertExperience(records: Experience[], data: Omit<Experience, 'id' | 'createdAt' | 'updatedAt' | 'order'>) {
   const newExperience: Experience = { 
     ...data, 
     id: nanoid(), 
-    order: fileData.experience.length, 
+    order: records.length, 
     createdAt: new Date().toISOString(), 
     updatedAt: new Date().toISOString() 
   };
-  fileData.experience.push(newExperience);
-  await fs.writeFile(experiencePath, JSON.stringify(fileData, null, 2));
-  return newExperience;
-};
+  return { records: [...records, newExperience], result: newExperience };
+}
 
-const updateExperience = async (id: string, updates: Partial<Experience>): Promise<Experience | null> => {
-  const fileData = await readDataFile<Experience>(experiencePath, { experience: [] });
-  const index = fileData.experience.findIndex(e => e.id === id);
-  if (index === -1) return null;
-  
-  fileData.experience[index] = { 
-    ...fileData.experience[index], 
-    ...updates, 
-    updatedAt: new Date().toISOString() 
+const createExperience = (data: Omit<Experience, 'id' | 'createdAt' | 'updatedAt' | 'order'>): Promise<Experience> =>
+  mutateExperience(records => insertExperience(records, data));
+
+const updateExperience = (id: string, updates: Partial<Experience>): Promise<Experience | null> =>
+  mutateExperience(records => updateRecord(records, id, updates));
+
+const deleteExperience = (id: string): Promise<boolean> =>
+  mutateExperience(records => deleteRecord(records, id));
+
+const reorderExperience = (ids: string[]): Promise<Experience[]> =>
+  mutateExperience(records => {
+    const reordered = applyOrder(records, ids);
+    return { records: reordered, result: reordered };
+  });
+
+// --- Batches ---
+// A batch is an ordered list of creates, updates and deletes across both collections.
+// Each collection's operations run as one mutation, and the mutations commit together
+// (see commitTogether), so the whole batch costs one write per collection. It is
+// rejected as a whole if any operation is malformed or targets a missing record at
+// commit time, so a bad batch, or one that loses a race with a concurrent delete,
+// changes nothing.
+
+export type Operation =
+  | { op: 'create'; type: 'projects' | 'experience'; data: any }
+  | { op: 'update'; type: 'projects' | 'experience'; id: string; data: any }
+  | { op: 'delete'; type: 'projects' | 'experience'; id: string };
+
+export class InvalidOperation extends Error {}
+
+function checkOperation(operation: any, index: number): Operation {
+  const fail = (reason: string): never => { throw new InvalidOperation(`Operation ${index}: ${reason}`); };
+  if (!operation || typeof operation !== 'object') fail('not an object');
+  if (operation.type !== 'projects' && operation.type !== 'experience') fail('invalid type');
+  if (!['create', 'update', 'delete'].includes(operation.op)) fail('invalid op');
+  if (operation.op !== 'create' && typeof operation.id !== 'string') fail('id must be a string');
+  if (operation.op !== 'delete' && (!operation.data || typeof operation.data !== 'object')) fail('data must be an object');
+  return operation;
+}
+
+function applyOperations<T extends { id: string; order: number; updatedAt: string }>(
+  operations: { operation: Operation; index: number }[],
+  insert: (records: T[], data: any) => { records: T[]; result: T },
+): Mutation<T, unknown[]> {
+  return records => {
+    const results: unknown[] = [];
+    for (const { operation, index } of operations) {
+      const step = operation.op === 'create' ? insert(records, operation.data)
+        : operation.op === 'update' ? updateRecord(records, operation.id, operation.data)
+        : deleteRecord(records, operation.id);
+      if (step.result === null || step.result === false) {
+        throw new InvalidOperation(`Operation ${index}: ${operation.type} ${(operation as { id: string }).id} not found`);
+      }
+      records = step.records;
+      results.push(step.result);
+    }
+    return { records, result: results };
   };
-  await fs.writeFile(experiencePath, JSON.stringify(fileData, null, 2));
-  return fileData.experience[index];
-};
+}
 
-const deleteExperience = async (id: string): Promise<boolean> => {
-  const fileData = await readDataFile<Experience>(experiencePath, { experience: [] });
-  const filtered = fileData.experience.filter(e => e.id !== id);
-  if (filtered.length === fileData.experience.length) return false;
-  
-  fileData.experience = filtered.map((e, i) => ({ ...e, order: i }));
-  await fs.writeFile(experiencePath, JSON.stringify(fileData, null, 2));
-  return true;
+// Applies a batch and returns each operation's result in order: the created or updated
+// record, or true for a delete.
+const applyBatch = async (input: unknown): Promise<unknown[]> => {
+  if (!Array.isArray(input)) throw new InvalidOperation('operations must be an array');
+  const operations = input.map(checkOperation).map((operation, index) => ({ operation, index }));
+  const ofType = (type: Operation['type']) => operations.filter(o => o.operation.type === type);
+  const changes: Change<any>[] = [];
+  if (ofType('projects').length) changes.push({
+    store: projectsStore,
+    load: projectsSnapshot,
+    mutation: applyOperations<Project>(ofType('projects'), insertProject),
+    onCommit: updateProjectFiles,
+  });
+  if (ofType('experience').length) changes.push({
+    store: experienceStore,
+    load: experienceSnapshot,
+    mutation: applyOperations<Experience>(ofType('experience'), insertExperience),
+  });
+
+  const results: Record<Operation['type'], unknown[]> = { projects: [], experience: [] };
+  (await commitTogether(changes)).forEach((result, i) => {
+    results[changes[i].store.name as Operation['type']] = result;
+  });
+  const taken = { projects: 0, experience: 0 };
+  return operations.map(({ operation }) => results[operation.type][taken[operation.type]++]);
 };
 
 export { 
+  PAGE_LIMIT,
   getProjects, 
   getProject, 
+  getProjectSummaries,
+  getProjectFields,
+  getProjectPage,
+  getProjectCategories,
+  getCategoryIndex,
+  getProjectBundle,
+  getProjectIds,
   createProject, 
   updateProject, 
   deleteProject,
+  reorderProjects,
   getExperiences, 
+  getExperienceFields,
   createExperience, 
   updateExperience, 
-  deleteExperience
+  deleteExperience,
+  reorderExperience,
+  applyBatch,
 };
+""",
+        "portfolio/lib/storage.ts": """
+import fs from 'fs/promises';
+import { mkdirSync } from 'fs';
+import path from 'path';
+import type BetterSqlite3 from 'better-sqlite3';
+import { STORAGE_BACKEND } from './storage-config';
+
+// --- Storage backends for lib/data.ts ---
+// A collection (projects, experience) is stored under data/ by one of these backends,
+// selected with `python Code2.py --storage` (lib/storage-config.ts) or DATA_STORAGE:
+//
+//   json     data/<name>.json, rewritten atomically on every commit.
+//   journal  data/<name>.json as the last compacted snapshot plus data/<name>.journal.jsonl,
+//            to which each commit appends one compact line per changed record. The log
+//            is folded into the snapshot once it grows past JOURNAL_COMPACT_BYTES
+//            (or offline with `python data_tools.py compact`).
+//   sqlite   data/portfolio.db (better-sqlite3), one table per collection holding each
+//            record as JSON next to indexed id, order and category columns; each commit
+//            is one transaction. Import existing JSON with `python data_tools.py import-sqlite`.
+//   sharded  data/<name>/<id>.json per record plus data/<name>.index.json holding just the
+//            index fields of every record, so listings never parse full records and a
+//            detail page reads one file. Convert with `python data_tools.py shard`.
+//
+// The file backends assume this server is the only writer while it runs.
+
+export const dataDir = path.join(process.cwd(), 'data');
+
+export type StorageKind = 'json' | 'journal' | 'sqlite' | 'sharded';
+
+export const storageKind = (process.env.DATA_STORAGE || STORAGE_BACKEND) as StorageKind;
+
+// Version of the stored record format, kept in every data file as `schemaVersion`.
+// 1 (or missing): projects may still carry the legacy `images` list and are migrated
+// on read. 2: every project has a `gallery` with stable ids. Files are upgraded
+// once, offline, with `python data_tools.py migrate`.
+export const SCHEMA_VERSION = 2;
+
+export interface Collection<T> {
+  name: string;
+  // Files whose changes invalidate records read earlier.
+  files: string[];
+  // Cheap token that changes whenever the stored records do.
+  stamp(): Promise<string>;
+  load(): Promise<{ stamp: string; records: T[]; schemaVersion: number }>;
+  // Stores `next`, which was derived from `previous`; records that are unchanged keep
+  // their identity. Returns the new stamp.
+  persist(previous: T[], next: T[]): Promise<string>;
+  // Fast paths of backends that store an index apart from the records: the index
+  // fields of every record sorted by order, and a single record by id.
+  index?(): Promise<{ stamp: string; entries: Partial<T>[] }>;
+  record?(id: string): Promise<T | null>;
+}
+
+const JOURNAL_COMPACT_BYTES = 256 * 1024;
+
+type JournalEntry<T> = { op: 'put'; record: T } | { op: 'del'; id: string };
+
+// Splits a commit into the records that must be stored and the ids that must be removed.
+function changes<T extends { id: string }>(previous: T[], next: T[]) {
+  const before = new Map(previous.map(r => [r.id, r] as [string, T]));
+  const put: T[] = [];
+  for (const record of next) {
+    if (before.get(record.id) !== record) put.push(record);
+    before.delete(record.id);
+  }
+  return { put, del: Array.from(before.keys()) };
+}
+
+async function fileStamp(filePath: string): Promise<string> {
+  try {
+    const stat = await fs.stat(filePath);
+    return `${stat.mtimeMs}:${stat.size}`;
+  } catch (error: any) {
+    if (error.code === 'ENOENT') return '-';
+    throw error;
+  }
+}
+
+// Records written back are always in the current format: lib/data.ts migrates on read.
+const serialize = <T>(key: string, records: T[]) =>
+  JSON.stringify({ schemaVersion: SCHEMA_VERSION, [key]: records }, null, 2);
+
+async function ensureFile(filePath: string, key: string) {
+  await fs.mkdir(dataDir, { recursive: true });
+  try {
+    await fs.writeFile(filePath, serialize(key, []), { flag: 'wx' });
+  } catch (error: any) {
+    if (error.code !== 'EEXIST') throw error;
+  }
+}
+
+async function readRecords<T>(filePath: string, key: string): Promise<{ records: T[]; schemaVersion: number }> {
+  const data = JSON.parse(await fs.readFile(filePath, 'utf-8'));
+  return { records: data[key] || [], schemaVersion: data.schemaVersion ?? 1 };
+}
+
+async function writeAtomic(filePath: string, content: string) {
+  const tmpPath = `${filePath}.${process.pid}.tmp`;
+  await fs.writeFile(tmpPath, content);
+  await fs.rename(tmpPath, filePath);
+}
+
+async function readFrom(filePath: string, offset: number): Promise<Buffer> {
+  let handle;
+  try {
+    handle = await fs.open(filePath, 'r');
+  } catch (error: any) {
+    if (error.code === 'ENOENT') return Buffer.alloc(0);
+    throw error;
+  }
+  try {
+    const { size } = await handle.stat();
+    const buffer = Buffer.alloc(Math.max(0, size - offset));
+    if (buffer.length) await handle.read(buffer, 0, buffer.length, offset);
+    return buffer;
+  } finally {
+    await handle.close();
+  }
+}
+
+function jsonCollection<T>(name: string): Collection<T> {
+  const filePath = path.join(dataDir, `${name}.json`);
+  return {
+    name,
+    files: [filePath],
+    stamp: () => fileStamp(filePath),
+    async load() {
+      await ensureFile(filePath, name);
+      const stamp = await fileStamp(filePath);
+      return { stamp, ...await readRecords<T>(filePath, name) };
+    },
+    async persist(_previous, next) {
+      await writeAtomic(filePath, serialize(name, next));
+      return fileStamp(filePath);
+    },
+  };
+}
+
+function journalCollection<T extends { id: string }>(name: string): Collection<T> {
+  const snapshotPath = path.join(dataDir, `${name}.json`);
+  const logPath = path.join(dataDir, `${name}.journal.jsonl`);
+
+  // Records as of `offset` bytes into the log on top of the snapshot with `snapshotStamp`;
+  // later reads only replay the lines appended since.
+  let replayed: {
+    snapshotStamp: string;
+    schemaVersion: number;
+    offset: number;
+    records: Map<string, T>;
+  } | null = null;
+
+  const stamp = async () => `${await fileStamp(snapshotPath)}|${await fileStamp(logPath)}`;
+
+  async function replay() {
+    const snapshotStamp = await fileStamp(snapshotPath);
+    if (!replayed || replayed.snapshotStamp !== snapshotStamp) {
+      const { records, schemaVersion } = await readRecords<T>(snapshotPath, name);
+      replayed = { snapshotStamp, schemaVersion, offset: 0, records: new Map(records.map(r => [r.id, r] as [string, T])) };
+    }
+    const tail = await readFrom(logPath, replayed.offset);
+    // A torn last line (a crash mid-append) is left for the next read or ignored for good.
+    const end = tail.lastIndexOf(0x0a) + 1;
+    for (const line of tail.subarray(0, end).toString('utf-8').split('\\n')) {
+      if (!line) continue;
+      const entry: JournalEntry<T> = JSON.parse(line);
+      if (entry.op === 'put') replayed.records.set(entry.record.id, entry.record);
+      else replayed.records.delete(entry.id);
+    }
+    replayed.offset += end;
+    return replayed;
+  }
+
+  async function compact(records: T[]) {
+    await writeAtomic(snapshotPath, serialize(name, records));
+    await fs.rm(logPath, { force: true });
+    replayed = null;
+  }
+
+  return {
+    name,
+    files: [snapshotPath, logPath],
+    stamp,
+    async load() {
+      await ensureFile(snapshotPath, name);
+      const current = await stamp();
+      try {
+        const { records, schemaVersion } = await replay();
+        return { stamp: current, records: Array.from(records.values()), schemaVersion };
+      } catch (error) {
+        replayed = null; // Start over from the snapshot on the next read.
+        throw error;
+      }
+    },
+    async persist(previous, next) {
+      const { put, del } = changes(previous, next);
+      const lines = [
+        ...put.map(record => JSON.stringify({ op: 'put', record })),
+        ...del.map(id => JSON.stringify({ op: 'del', id })),
+      ];
+      if (lines.length) await fs.appendFile(logPath, lines.join('\\n') + '\\n');
+      const { size } = await fs.stat(logPath).catch(() => ({ size: 0 }));
+      if (size > JOURNAL_COMPACT_BYTES) await compact(next);
+      return stamp();
+    },
+  };
+}
+
+const sqlitePath = path.join(dataDir, 'portfolio.db');
+let database: BetterSqlite3.Database | null = null;
+
+// Keep in step with SQLITE_SCHEMA in data_tools.py.
+function openDatabase(): BetterSqlite3.Database {
+  if (!database) {
+    // Loaded lazily so the other backends work without the native module installed.
+    const Database: typeof BetterSqlite3 = require('better-sqlite3');
+    mkdirSync(dataDir, { recursive: true });
+    database = new Database(sqlitePath);
+    database.pragma('journal_mode = WAL');
+    database.exec('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)');
+    database.prepare("INSERT OR IGNORE INTO meta (key, value) VALUES ('schemaVersion', ?)").run(String(SCHEMA_VERSION));
+  }
+  return database;
+}
+
+function sqliteCollection<T extends { id: string }>(name: string): Collection<T> {
+  const db = openDatabase();
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS ${name} (
+      id TEXT PRIMARY KEY,
+      "order" INTEGER NOT NULL DEFAULT 0,
+      category TEXT,
+      data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS ${name}_order ON ${name} ("order");
+    CREATE INDEX IF NOT EXISTS ${name}_category ON ${name} (category, "order");
+  `);
+  const selectAll = db.prepare(`SELECT data FROM ${name} ORDER BY "order"`).pluck();
+  const selectVersion = db.prepare("SELECT value FROM meta WHERE key = 'schemaVersion'").pluck();
+  const upsert = db.prepare(`
+    INSERT INTO ${name} (id, "order", category, data) VALUES (@id, @order, @category, @data)
+    ON CONFLICT (id) DO UPDATE SET "order" = excluded."order", category = excluded.category, data = excluded.data
+  `);
+  const remove = db.prepare(`DELETE FROM ${name} WHERE id = ?`);
+  const apply = db.transaction((put: T[], del: string[]) => {
+    for (const record of put) {
+      const { order, category } = record as { order?: number; category?: string };
+      upsert.run({ id: record.id, order: order ?? 0, category: category ?? null, data: JSON.stringify(record) });
+    }
+    for (const id of del) remove.run(id);
+  });
+
+  // data_version changes when another connection commits; our own commits are counted.
+  let commits = 0;
+  const stamp = async () => `${db.pragma('data_version', { simple: true })}:${commits}`;
+
+  return {
+    name,
+    files: [sqlitePath, `${sqlitePath}-wal`],
+    stamp,
+    async load() {
+      const records = (selectAll.all() as string[]).map(data => JSON.parse(data) as T);
+      return { stamp: await stamp(), records, schemaVersion: Number(selectVersion.get() ?? 1) };
+    },
+    async persist(previous, next) {
+      const { put, del } = changes(previous, next);
+      if (put.length || del.length) {
+        apply(put, del);
+        commits++;
+      }
+      return stamp();
+    },
+  };
+}
+
+const RECORD_ID = /^[\\w-]+$/;
+
+function shardedCollection<T extends { id: string; order: number }>(name: string, indexFields: (keyof T)[]): Collection<T> {
+  const indexPath = path.join(dataDir, `${name}.index.json`);
+  const recordDir = path.join(dataDir, name);
+  const recordPath = (id: string) => {
+    // Ids come from URLs; never let one escape the record directory.
+    if (!RECORD_ID.test(id)) throw new Error(`Invalid record id: ${id}`);
+    return path.join(recordDir, `${id}.json`);
+  };
+  const pick = (record: T) =>
+    Object.fromEntries(indexFields.filter(field => field in record).map(field => [field, record[field]])) as Partial<T>;
+
+  // The index is rewritten last on every commit, so its stamp covers the whole collection.
+  async function readIndex() {
+    await ensureFile(indexPath, name);
+    const stamp = await fileStamp(indexPath);
+    return { stamp, ...await readRecords<Partial<T>>(indexPath, name) };
+  }
+
+  return {
+    name,
+    files: [indexPath],
+    stamp: () => fileStamp(indexPath),
+    async load() {
+      const { stamp, records: entries, schemaVersion } = await readIndex();
+      const records = await Promise.all(entries.map(async entry =>
+        JSON.parse(await fs.readFile(recordPath(entry.id!), 'utf-8')) as T));
+      return { stamp, records, schemaVersion };
+    },
+    async index() {
+      const { stamp, records: entries } = await readIndex();
+      return { stamp, entries };
+    },
+    async record(id) {
+      if (!RECORD_ID.test(id)) return null;
+      try {
+        return JSON.parse(await fs.readFile(recordPath(id), 'utf-8'));
+      } catch (error: any) {
+        if (error.code === 'ENOENT') return null;
+        throw error;
+      }
+    },
+    async persist(previous, next) {
+      const { put, del } = changes(previous, next);
+      await fs.mkdir(recordDir, { recursive: true });
+      await Promise.all(put.map(record => writeAtomic(recordPath(record.id), JSON.stringify(record, null, 2))));
+      const entries = [...next].sort((a, b) => a.order - b.order).map(pick);
+      await writeAtomic(indexPath, serialize(name, entries));
+      await Promise.all(del.map(id => fs.rm(recordPath(id), { force: true })));
+      return fileStamp(indexPath);
+    },
+  };
+}
+
+// --- Per-record bundles ---
+// Derived, read-optimized files (data/bundles/<name>/<id>.json) that a page renders
+// from with a single read. They are not a storage backend: lib/data.ts rewrites the
+// affected ones after each commit, and `python data_tools.py bundles` rebuilds them all.
+// data/bundles/<name>.version holds the version of the records they were built from
+// (see recordsVersion in lib/data.ts); bundles of any other version are not used.
+
+const bundleDir = (name: string) => path.join(dataDir, 'bundles', name);
+
+export async function readBundle<B>(name: string, id: string): Promise<B | null> {
+  if (!RECORD_ID.test(id)) return null;
+  try {
+    return JSON.parse(await fs.readFile(path.join(bundleDir(name), `${id}.json`), 'utf-8'));
+  } catch (error: any) {
+    if (error.code === 'ENOENT') return null;
+    throw error;
+  }
+}
+
+const versionPath = (name: string) => `${bundleDir(name)}.version`;
+
+export async function readBundleVersion(name: string): Promise<string | null> {
+  try {
+    return (await fs.readFile(versionPath(name), 'utf-8')).trim();
+  } catch (error: any) {
+    if (error.code === 'ENOENT') return null;
+    throw error;
+  }
+}
+
+// Records the version the bundles now reflect; null marks them as not current.
+export async function writeBundleVersion(name: string, version: string | null) {
+  if (version === null) return fs.rm(versionPath(name), { force: true });
+  await fs.mkdir(path.dirname(versionPath(name)), { recursive: true });
+  await writeAtomic(versionPath(name), version);
+}
+
+// Ids of every bundle written for `name`.
+export async function listBundles(name: string): Promise<string[]> {
+  try {
+    return (await fs.readdir(bundleDir(name))).filter(file => file.endsWith('.json')).map(file => file.slice(0, -5));
+  } catch (error: any) {
+    if (error.code === 'ENOENT') return [];
+    throw error;
+  }
+}
+
+export async function writeBundles<B>(name: string, put: { id: string; bundle: B }[], del: string[]) {
+  const dir = bundleDir(name);
+  await fs.mkdir(dir, { recursive: true });
+  await Promise.all([
+    ...put.filter(({ id }) => RECORD_ID.test(id))
+      .map(({ id, bundle }) => writeAtomic(path.join(dir, `${id}.json`), JSON.stringify(bundle))),
+    ...del.filter(id => RECORD_ID.test(id)).map(id => fs.rm(path.join(dir, `${id}.json`), { force: true })),
+  ]);
+}
+
+// data/category-index.json, the projects page's filter tabs, imported at build time.
+// lib/data.ts rewrites it after each project commit, as `data_tools.py category-index` does.
+export async function writeCategoryIndex(index: object) {
+  await fs.mkdir(dataDir, { recursive: true });
+  await writeAtomic(path.join(dataDir, 'category-index.json'), JSON.stringify(index, null, 2));
+}
+
+// `indexFields` are the fields the sharded backend keeps in its index file.
+export function openCollection<T extends { id: string; order: number }>(
+  name: string,
+  indexFields: (keyof T)[] = ['id', 'order'],
+): Collection<T> {
+  switch (storageKind) {
+    case 'json':
+      return jsonCollection<T>(name);
+    case 'journal':
+      return journalCollection<T>(name);
+    case 'sqlite':
+      return sqliteCollection<T>(name);
+    case 'sharded':
+      return shardedCollection<T>(name, indexFields);
+    default:
+      throw new Error(`Unknown DATA_STORAGE backend: ${storageKind}`);
+  }
+}
+""",
+        "portfolio/lib/storage-config.ts": """
+// The storage backend lib/storage.ts uses (json | journal | sqlite | sharded), written
+// by `python Code2.py --storage <backend>`; rerun that rather than editing this file.
+// DATA_STORAGE in the environment overrides it, e.g. `DATA_STORAGE=journal npm run bench:data`.
+export const STORAGE_BACKEND = 'json';
 """,
         "portfolio/lib/cloudinary.ts": """
 import { v2 as cloudinary } from 'cloudinary';
@@ -3978,6 +5294,137 @@ sounds.forEach(soundFile => {
 });
 
 console.log('\\nSound generation complete! All placeholder sounds are functional.');
+""",
+        "portfolio/scripts/bench-data.ts": """
+// Measures mutation throughput of lib/data.ts under concurrent load.
+//
+//   npm run bench:data -- --ops 2000 --concurrency 64 --seed 200
+//   DATA_STORAGE=journal npm run bench:data
+//
+// Runs against a throwaway data directory, so the real data/ is never touched. After
+// the run the store is checked for lost writes: every create and delete must be
+// reflected in the final record count.
+import fs from 'fs/promises';
+import os from 'os';
+import path from 'path';
+
+function option(name: string, fallback: number): number {
+  const index = process.argv.indexOf(`--${name}`);
+  return index >= 0 ? Number(process.argv[index + 1]) : fallback;
+}
+
+const sample = (i: number) => ({
+  title: `Project ${i}`,
+  description: '<p>' + 'Lorem ipsum dolor sit amet. '.repeat(40) + '</p>',
+  category: ['web', 'game', 'mobile'][i % 3],
+  thumbnail: `https://example.com/thumb-${i}.png`,
+  gallery: [],
+  tags: ['bench'],
+  links: {},
+});
+
+function percentile(sorted: number[], p: number) {
+  return sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+async function main() {
+  const ops = option('ops', 1000);
+  const concurrency = option('concurrency', 32);
+  const seed = option('seed', 100);
+
+  const dir = await fs.mkdtemp(path.join(os.tmpdir(), 'portfolio-bench-data-'));
+  process.chdir(dir); // lib/data.ts resolves data/ against the cwd when it is imported
+  const data = await import('../lib/data');
+
+  // Count file commits and bytes: every batch ends in one rename (json, journal
+  // compaction) or one append (journal) on a data file. Page bundles under
+  // data/bundles/ and data/category-index.json are derived files and not counted.
+  let commits = 0, bytes = 0;
+  const { rename, writeFile, appendFile } = fs;
+  const sizeOf = (data: unknown) => typeof data === 'string' ? Buffer.byteLength(data) : 0;
+  const isDerived = (file: unknown) =>
+    String(file).includes(`${path.sep}bundles${path.sep}`) || String(file).includes('category-index.json');
+  fs.rename = ((...args: Parameters<typeof rename>) => {
+    if (!isDerived(args[1])) commits++;
+    return rename(...args);
+  }) as typeof fs.rename;
+  fs.writeFile = ((...args: Parameters<typeof writeFile>) => {
+    if (!isDerived(args[0])) bytes += sizeOf(args[1]);
+    return writeFile(...args);
+  }) as typeof fs.writeFile;
+  fs.appendFile = ((...args: Parameters<typeof appendFile>) => {
+    commits++;
+    bytes += sizeOf(args[1]);
+    return appendFile(...args);
+  }) as typeof fs.appendFile;
+
+  try {
+    const seeded = await Promise.all(Array.from({ length: seed }, (_, i) => data.createProject(sample(i))));
+    const seededIds = seeded.map(p => p.id);
+    commits = bytes = 0;
+
+    let next = 0, creates = 0, deletes = 0;
+    const latencies: number[] = [];
+    const worker = async () => {
+      const own: string[] = [];
+      while (next < ops) {
+        const n = next++;
+        const start = performance.now();
+        const roll = n % 10;
+        if (roll < 6) {
+          await data.updateProject(seededIds[n % seededIds.length], { title: `Project ${n}` });
+        } else if (roll < 8 || own.length === 0) {
+          own.push((await data.createProject(sample(n))).id);
+          creates++;
+        } else if (roll < 9) {
+          if (await data.deleteProject(own.pop()!)) deletes++;
+        } else {
+          await data.reorderProjects([...seededIds].reverse());
+        }
+        latencies.push(performance.now() - start);
+      }
+    };
+
+    const start = performance.now();
+    await Promise.all(Array.from({ length: concurrency }, worker));
+    const elapsed = (performance.now() - start) / 1000;
+
+    const expected = seed + creates - deletes;
+    const actual = (await data.getProjects()).length;
+    let size = 0;
+    for (const name of await fs.readdir(path.join(dir, 'data'))) {
+      if (name.startsWith('projects.') || name.startsWith('portfolio.db')) size += (await fs.stat(path.join(dir, 'data', name))).size;
+    }
+    latencies.sort((a, b) => a - b);
+
+    const { storageKind: storage } = await import('../lib/storage');
+    console.log(`storage:      ${storage}`);
+    console.log(`ops:          ${ops} (${concurrency} concurrent clients)`);
+    console.log(`throughput:   ${(ops / elapsed).toFixed(0)} ops/s`);
+    console.log(`latency:      p50 ${percentile(latencies, 0.5).toFixed(1)} ms, p95 ${percentile(latencies, 0.95).toFixed(1)} ms`);
+    if (storage === 'sqlite') {
+      console.log('file commits: n/a (SQLite transactions bypass fs)');
+    } else {
+      console.log(`file commits: ${commits} (${(ops / Math.max(commits, 1)).toFixed(1)} mutations per write)`);
+      console.log(`written:      ${(bytes / 1024 / 1024).toFixed(1)} MiB (${(bytes / ops / 1024).toFixed(1)} KiB per mutation)`);
+    }
+    console.log(`final data:   ${actual} projects, ${(size / 1024).toFixed(0)} KiB on disk`);
+    if (actual !== expected) {
+      console.error(`Lost writes: expected ${expected} projects, found ${actual}`);
+      process.exitCode = 1;
+    }
+  } finally {
+    fs.rename = rename;
+    fs.writeFile = writeFile;
+    fs.appendFile = appendFile;
+    await fs.rm(dir, { recursive: true, force: true });
+  }
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
 """,
         # --- Public Files ---
         "portfolio/public/robots.txt": """
@@ -4010,13 +5457,32 @@ Expected path: `/public/models/Meshy_Merged_Animations.glb`
         # --- Data Files ---
         "portfolio/data/projects.json": """
 {
+  "schemaVersion": 2,
   "projects": []
 }
 """,
         "portfolio/data/experience.json": """
 {
+  "schemaVersion": 2,
   "experience": []
 }
+""",
+        "portfolio/data/published.json": """
+{}
+""",
+        "portfolio/data/category-index.json": """
+{
+  "pageSize": 12,
+  "categories": [
+    {
+      "name": "All",
+      "count": 0,
+      "ids": [],
+      "firstPage": [],
+      "nextCursor": null
+    }
+  ]
+}
 """,
         # --- Types ---
         "portfolio/types/next-auth.d.ts": """
@@ -4038,13 +5504,160 @@ declare module "next-auth/jwt" {
 """,
     }
 
-    # Write remaining files
-    for path, content in remaining_files.items():
-        write_file(path, content)
-    
-    # Create the models directory
-    create_directory("portfolio/public/models")
-    create_directory("portfolio/data")
+def apply_options(files, storage="json", projects_page="client"):
+    """
+    Returns rendered templates with the generator options applied; templates hold the
+    defaults. Also used by the registry for --only and --watch, so `files` may be partial.
+    """
+    files = dict(files)
+    config = "portfolio/lib/storage-config.ts"
+    if config in files:
+        files[config] = files[config].replace("STORAGE_BACKEND = 'json'", f"STORAGE_BACKEND = '{storage}'")
+    # "<path>#server" is the --projects-page server body of <path>; never written as is
+    page = "portfolio/app/projects/page.tsx"
+    server = files.pop(page + "#server", None)
+    if projects_page == "server":
+        files.pop(page, None)
+        if server is not None:
+            files[page] = server
+    return files
+
+def render_files(storage="json", projects_page="client"):
+    """Returns every generated file keyed by path, exactly as it is written to disk."""
+    files = {}
+    for builder in (build_project_files, build_remaining_files):
+        for path, content in builder().items():
+            files[path] = content.strip()
+    return apply_options(files, storage, projects_page)
+
+def generator_options(args, recorded=None):
+    """
+    Returns the options to render with: flags given on this run, else the `recorded` ones
+    (from portfolio/'s manifest), else the defaults. Every full render records them again.
+    """
+    recorded = recorded or {}
+    return {"storage": args.storage or recorded.get("storage", "json"),
+            "projects_page": args.projects_page or recorded.get("projects_page", "client")}
+
+def update_portfolio(args, options):
+    """Rewrites only the files of an existing tree whose rendered content changed."""
+    print("🔁 Updating Futuristic Isometric Arena Portfolio...")
+    files = render_files(**options)
+    start = time.perf_counter()
+    try:
+        changed, stale, conflicts, timings = update_tree(files, "portfolio", workers=args.jobs, options=options,
+                                                         force=args.force, carriers=OPTION_FILES)
+    except OSError as e:
+        print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.timings:
+        report_timings(timings, time.perf_counter() - start)
+    for path in changed:
+        print(f"  ✎ {path}")
+    for path in stale:
+        print(f"  ✗ {path}")
+    for path in conflicts:
+        print(f"  ⚠ {path} was edited locally or predates the manifest; left as is (--force overwrites)",
+              file=sys.stderr)
+    override = env_storage("portfolio/.env.local")
+    if override and override != options["storage"]:
+        print(f"  ⚠ portfolio/.env.local sets DATA_STORAGE={override}, which overrides --storage "
+              f"{options['storage']}; remove that line to use it", file=sys.stderr)
+    print(f"\n{'⚠️' if conflicts else '✅'} {len(changed)} written, {len(stale)} removed, "
+          f"{len(conflicts)} conflicts, {len(files) - len(changed) - len(conflicts)} unchanged.")
+
+def env_storage(path):
+    """Returns the DATA_STORAGE set in an env file (trees generated before lib/storage-config.ts), or None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            match = re.search(r"^DATA_STORAGE=(\S+)", f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+def publish_portfolio():
+    """Publishes the data of an existing tree as hashed static JSON for read-only deployments."""
+    if not os.path.isdir(DEFAULT_DATA_DIR):
+        print(f"Error: no data directory at {DEFAULT_DATA_DIR}; generate the portfolio first.", file=sys.stderr)
+        sys.exit(1)
+    try:
+        urls = publish(DEFAULT_DATA_DIR, PUBLIC_DATA_DIR)
+    except OSError as e:
+        print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (ValueError, KeyError) as e:
+        print(f"Error: malformed data file: {e}", file=sys.stderr)
+        sys.exit(1)
+    for name, url in urls.items():
+        print(f"  📦 {name}: {url}")
+    print("\n✅ Published. Deploy with NEXT_PUBLIC_DATA_MODE=static to serve these files.")
+
+def main():
+    """Main function to generate the entire project structure and files."""
+    parser = argparse.ArgumentParser(description="Generate the Futuristic Isometric Arena portfolio.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="update an existing portfolio/ tree, rewriting only files whose content changed")
+    parser.add_argument("--force", action="store_true",
+                        help="with --incremental, also overwrite files edited locally (data/ seeds are still kept)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_WORKERS, help="number of parallel file writers")
+    parser.add_argument("--timings", action="store_true", help="print per-file write timings")
+    parser.add_argument("--only", action="append", metavar="PATH",
+                        help="re-emit just this template (relative to portfolio/); may be repeated")
+    parser.add_argument("--archive", choices=ARCHIVE_FORMATS,
+                        help="stream the project to stdout as a reproducible archive instead of writing portfolio/")
+    parser.add_argument("--watch", action="store_true",
+                        help="re-emit templates into portfolio/ as they are edited in this file")
+    parser.add_argument("--storage", choices=STORAGE_BACKENDS,
+                        help="data storage backend written to lib/storage-config.ts (journal appends edits to a log, "
+                             "sqlite uses data/portfolio.db, sharded keeps one file per record plus an index); "
+                             "default: json, or with --incremental/--only/--watch the one portfolio/ was generated with")
+    parser.add_argument("--projects-page", choices=PROJECTS_PAGES,
+                        help="render app/projects/page.tsx on the client from the build-time category index, "
+                             "or on the server from lib/data with ISR; default: client, or with --incremental/--only/"
+                             "--watch the one portfolio/ was generated with")
+    parser.add_argument("--publish", action="store_true",
+                        help="write portfolio/data as hashed static JSON under portfolio/public/data "
+                             "for read-only deployments (NEXT_PUBLIC_DATA_MODE=static)")
+    args = parser.parse_args()
+
+    if args.publish:
+        publish_portfolio()
+        return
+
+    if args.only:
+        emit_only(__file__, args.only, workers=args.jobs)
+        return
+
+    if args.watch:
+        watch_templates(__file__, workers=args.jobs)
+        return
+
+    if args.archive:
+        # Archives depend only on the templates and flags, never on a local tree
+        write_archive(render_files(**generator_options(args)), args.archive, sys.stdout.buffer, ["portfolio/public/models", "portfolio/data"])
+        return
+
+    if args.incremental and os.path.exists("portfolio"):
+        update_portfolio(args, generator_options(args, load_options("portfolio")))
+        return
+
+    if os.path.exists("portfolio"):
+        print("Error: A 'portfolio' directory already exists. Remove it first or pass --incremental.", file=sys.stderr)
+        sys.exit(1)
+
+    print("🚀 Generating Futuristic Isometric Arena Portfolio...")
+
+    # Write all files into a staging directory, plus the models and data directories, then swap it in
+    options = generator_options(args)
+    start = time.perf_counter()
+    try:
+        timings = build_tree(render_files(**options), "portfolio", ["portfolio/public/models", "portfolio/data"],
+                             workers=args.jobs, options=options)
+    except OSError as e:
+        print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.timings:
+        report_timings(timings, time.perf_counter() - start)
         
     print("\n✅ FUTURISTIC ISOMETRIC ARENA PORTFOLIO COMPLETE!")
     print("\n🎯 PHASE I: WORLD & CHARACTER ARCHITECTURE ✓")
@@ -4097,6 +5710,11 @@ declare module "next-auth/jwt" {
     print("  • Experience: Timeline entries with skills")
     print("  • All content supports drag-and-drop reordering")
     print("  • Rich text editing with TipTap")
+    print("  • Concurrent edits are group-committed (npm run bench:data)")
+    print("  • Journal storage: --storage journal, maintain with data_tools.py")
+    print("  • Legacy project images: python data_tools.py migrate")
+    print("  • SQLite storage: --storage sqlite, load JSON with data_tools.py import-sqlite")
+    print("  • Sharded storage: --storage sharded, convert JSON with data_tools.py shard")
     
     print("\n🎨 THE ARENA AWAITS!")
 
@@ -3,24 +3,14 @@
 Portfolio Fix Script - Resolves theme toggle and project loading issues
 """
 
-import os
 import json
 
-def create_file(filepath, content):
-    """Create or update a file with the given content."""
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
-    print(f"✓ Fixed: {filepath}")
+from patcher import apply_edits, create, hunk, patch, report
 
-def fix_portfolio_issues():
-    """Apply fixes for theme toggle and project loading."""
-    
-    print("🔧 Fixing Portfolio Issues\n")
+def fixes():
+    """Returns the edits for theme toggle and project loading, for the batched patch engine."""
     
     # Fix 1: Simplified data layer
-    print("📊 Fixing data layer (lib/data.ts)...")
-    
     data_ts = """import fs from 'fs/promises';
 import path from 'path';
 
@@ -62,11 +52,7 @@ export const getProjects = async (): Promise<Project[]> => {
 // All Experience-related functions are removed.
 // GalleryItem and Experience interfaces are removed."""
     
-    create_file('portfolio/lib/data.ts', data_ts)
-    
     # Fix 2: Simplified API route
-    print("\n🌐 Fixing API route (app/api/data/route.ts)...")
-    
     api_route = """import { NextRequest, NextResponse } from 'next/server';
 import { getProjects } from '@/lib/data';
 
@@ -91,76 +77,26 @@ export async function GET(request: NextRequest) {
 
 // POST, PUT, DELETE handlers are removed as the admin panel is no longer part of the scope."""
     
-    create_file('portfolio/app/api/data/route.ts', api_route)
-    
-    # Fix 3: Layout with Header component
-    print("\n🎨 Fixing layout with Header component (app/layout.tsx)...")
-    
-    layout = """import type { Metadata } from 'next';
-import { Orbitron, Rajdhani } from 'next/font/google';
-import './globals.css';
-import { Providers } from '@/components/Providers';
-import { Header } from '@/components/ui/Header'; // Import the new Header
-import { Toaster } from 'react-hot-toast';
-
-const orbitron = Orbitron({ 
-  subsets: ['latin'],
-  variable: '--font-orbitron',
-  display: 'swap',
-});
-
-const rajdhani = Rajdhani({ 
-  subsets: ['latin'],
-  variable: '--font-rajdhani',
-  weight: ['300', '400', '500', '600', '700'],
-  display: 'swap',
-});
-
-export const metadata: Metadata = {
-  title: 'Portfolio | Taha Mohammed',
-  description: 'The professional portfolio of Taha Mohammed, a Mechatronics Engineer and Creative Developer.',
-  keywords: ['mechatronics', 'engineering', 'motion design', '3D', 'portfolio', 'Tahactw'],
-  openGraph: {
-    title: 'Portfolio | Taha Mohammed',
-    description: 'Explore the work of Taha Mohammed in engineering and creative development.',
-    type: 'website',
-  },
-};
-
-export default function RootLayout({
-  children,
-}: {
-  children: React.ReactNode;
-}) {
-  return (
-    <html lang="en" suppressHydrationWarning className={`${orbitron.variable} ${rajdhani.variable}`}>
-      <body className="relative bg-arena-dark text-text-primary antialiased font-body">
-        <Providers>
-          <Header />
-          <main>{children}</main>
-          <Toaster 
-            position="bottom-right" 
-            toastOptions={{
-              className: 'glass',
-              style: {
-                background: 'var(--color-arena-dark)',
-                color: 'var(--color-text-primary)',
-                border: '1px solid var(--color-arena-border)',
-                fontFamily: 'var(--font-rajdhani)',
-              },
-            }}
-          />
-        </Providers>
-      </body>
-    </html>
-  );
-}"""
-    
-    create_file('portfolio/app/layout.tsx', layout)
+    # Fix 3: Layout with Header component, as anchored hunks so local layout edits survive
+    layout = [
+        hunk("import { DockNavigation } from '@/components/ui/DockNavigation';",
+             "import { Header } from '@/components/ui/Header'; // Import the new Header"),
+        hunk("""  title: 'Portfolio | Mechatronics Engineer & Creative Developer',
+  description: 'Mechatronics Engineering student with 5+ years in motion design and creative development',""",
+             """  title: 'Portfolio | Taha Mohammed',
+  description: 'The professional portfolio of Taha Mohammed, a Mechatronics Engineer and Creative Developer.',"""),
+        hunk("""    title: 'Portfolio | Mechatronics Engineer',
+    description: 'Explore my work in engineering and creative design',""",
+             """    title: 'Portfolio | Taha Mohammed',
+    description: 'Explore the work of Taha Mohammed in engineering and creative development.',""",
+             anchor="openGraph: {"),
+        hunk("""          {children}
+          <DockNavigation />""",
+             """          <Header />
+          <main>{children}</main>"""),
+    ]
     
     # Fix 4: Create sample projects.json if it doesn't exist
-    print("\n📁 Checking projects.json...")
-    
     projects_json = {
         "projects": [
             {
@@ -230,17 +166,25 @@ export default function RootLayout({
         ]
     }
     
-    # Create data directory and projects.json if they don't exist
-    os.makedirs('portfolio/data', exist_ok=True)
-    projects_path = 'portfolio/data/projects.json'
+    return [
+        # Fixes 1 and 2 replace the whole template, so they merge cleanly unless the file was edited locally.
+        patch('portfolio/lib/data.ts', [hunk(None, data_ts)]),
+        patch('portfolio/app/api/data/route.ts', [hunk(None, api_route)]),
+        patch('portfolio/app/layout.tsx', layout),
+        create('portfolio/data/projects.json', json.dumps(projects_json, indent=2)),
+    ]
+
+def fix_portfolio_issues():
+    """Apply fixes for theme toggle and project loading."""
+    
+    print("🔧 Fixing Portfolio Issues\n")
     
-    if not os.path.exists(projects_path):
-        with open(projects_path, 'w', encoding='utf-8') as f:
-            json.dump(projects_json, f, indent=2)
-        print(f"✓ Created: {projects_path}")
-    else:
-        print(f"✓ Exists: {projects_path}")
+    written, unchanged, conflicts = apply_edits(fixes())
+    report(written, unchanged, conflicts)
     
+    if conflicts:
+        print("\n⚠️  Some fixes collide with local edits; resolve them by hand and re-run.")
+        return
     print("\n✅ All fixes applied successfully!")
     print("\n🔍 Issues resolved:")
     print("   ✓ Projects data loading fixed with simplified data layer")
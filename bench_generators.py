@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the portfolio generators and fix scripts.
+
+Every measurement runs in a fresh interpreter so peak RSS and the import cost of the
+generator are attributed to that run alone. Each target is measured in a cold (fresh,
+empty) and a warm (already used) working directory, on disk and on tmpfs when one is
+available, and the results are emitted as JSON for regression tracking. The fix script
+patches a freshly generated Code2 tree, and the template cache it fills lives in the
+working directory, so no run inherits another's cache. I/O under that cache is reported
+separately ("cache") so a target's own counts cover only its output:
+
+    python bench_generators.py --repeat 5 --output bench.json
+"""
+
+import argparse
+import builtins
+import contextlib
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = ".scaffold-cache"  # per working directory, via SCAFFOLD_CACHE_DIR
+
+# target -> (script, argv passed to main(), entry point)
+TARGETS = {
+    "code": ("Code.py", [], "main"),
+    "code2": ("Code2.py", [], "main"),
+    "code2-incremental": ("Code2.py", ["--incremental"], "main"),
+    "fix": ("Modefication 1.py", [], "fix_portfolio_issues"),
+}
+
+# Targets that refuse to run over an existing tree; their warm runs start without one.
+FRESH_OUTPUT = {"code", "code2"}
+
+def load_script(filename):
+    """Imports a script by path (the fix scripts have spaces in their names)."""
+    name = os.path.splitext(filename)[0].replace(" ", "_").lower()
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def walk(root, exclude=None):
+    """os.walk() that skips the `exclude` directory."""
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = [d for d in dirs if os.path.join(directory, d) != exclude]
+        yield directory, dirs, names
+
+def snapshot(root, exclude=None):
+    """Returns {path: (size, mtime_ns, inode)} for every file under `root` outside `exclude`."""
+    files = {}
+    for directory, _, names in walk(root, exclude):
+        for name in names:
+            path = os.path.join(directory, name)
+            st = os.lstat(path)
+            files[path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+    return files
+
+def count_directories(root, exclude=None):
+    """Returns the number of directories below `root` outside `exclude`."""
+    return sum(len(dirs) for _, dirs, _ in walk(root, exclude))
+
+@contextlib.contextmanager
+def syscall_counters(separate=None):
+    """
+    Counts write-mode opens, mkdirs, renames and unlinks made by Python code in this process.
+
+    Yields (counts, separate_counts): calls on paths inside the `separate` directory are
+    counted in the second dict only.
+    """
+    counts = {"open_write": 0, "mkdir": 0, "rename": 0, "unlink": 0}
+    separate_counts = dict(counts)
+    separate = os.path.abspath(separate) if separate else None
+    lock = threading.Lock()
+
+    def bucket(path):
+        if separate and isinstance(path, (str, os.PathLike)):
+            path = os.path.abspath(os.fspath(path))
+            if path == separate or path.startswith(separate + os.sep):
+                return separate_counts
+        return counts
+
+    def counted(key, func):
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            with lock:
+                bucket(args[0])[key] += 1
+            return result
+        return wrapper
+
+    real_open = builtins.open
+    def counting_open(file, mode="r", *args, **kwargs):
+        handle = real_open(file, mode, *args, **kwargs)
+        if any(flag in mode for flag in "wax+"):
+            with lock:
+                bucket(file)["open_write"] += 1
+        return handle
+
+    patches = [(builtins, "open", counting_open), (os, "mkdir", counted("mkdir", os.mkdir)),
+               (os, "rename", counted("rename", os.rename)), (os, "replace", counted("rename", os.replace)),
+               (os, "remove", counted("unlink", os.remove)), (os, "unlink", counted("unlink", os.unlink))]
+    originals = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+    for obj, name, func in patches:
+        setattr(obj, name, func)
+    try:
+        yield counts, separate_counts
+    finally:
+        for obj, name, func in originals:
+            setattr(obj, name, func)
+
+def run_child(target, workdir):
+    """Runs one target inside `workdir` and prints its measurements as JSON."""
+    script, argv, entry = TARGETS[target]
+    os.chdir(workdir)
+    cache = os.path.join(".", CACHE_DIR)
+    before, cache_before = snapshot(".", exclude=cache), snapshot(cache)
+    dirs_before, cache_dirs_before = count_directories(".", exclude=cache), count_directories(cache)
+
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+            syscall_counters(separate=cache) as (counts, cache_counts):
+        module = load_script(script)
+        sys.argv = [script] + argv
+        getattr(module, entry)()
+    wall = time.perf_counter() - start
+
+    after, cache_after = snapshot(".", exclude=cache), snapshot(cache)
+    written = [path for path, stat in after.items() if before.get(path) != stat]
+    cache_written = [path for path, stat in cache_after.items() if cache_before.get(path) != stat]
+    json.dump({
+        "wall_s": wall,
+        "files_written": len(written),
+        "bytes_written": sum(after[path][0] for path in written),
+        "dirs_created": count_directories(".", exclude=cache) - dirs_before,
+        "syscalls": counts,
+        "cache": {
+            "files_written": len(cache_written),
+            "bytes_written": sum(cache_after[path][0] for path in cache_written),
+            "dirs_created": count_directories(cache) - cache_dirs_before,
+            "syscalls": cache_counts,
+        },
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }, sys.stdout)
+
+def measure(target, workdir):
+    """Runs a target in a fresh interpreter and returns its measurements."""
+    env = dict(os.environ, SCAFFOLD_CACHE_DIR=os.path.join(workdir, CACHE_DIR))
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", target, workdir],
+                          capture_output=True, text=True, env=env)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{target} failed in {workdir}:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+def prepare(target, workdir, state):
+    """Puts `workdir` into the state a cold or warm run of `target` expects."""
+    if target == "fix":
+        measure("code2", workdir)  # the fix script patches a generated tree
+    if state == "warm":
+        measure(target, workdir)  # primes page cache, dentries, the template cache and (incremental) the tree
+        if target in FRESH_OUTPUT:
+            shutil.rmtree(os.path.join(workdir, "portfolio"))
+        if target == "fix":
+            # The priming run already patched the tree; start the measured one unpatched
+            shutil.rmtree(os.path.join(workdir, "portfolio"))
+            measure("code2", workdir)
+    if target == "code2-incremental" and state == "cold":
+        measure("code2", workdir)
+        os.remove(os.path.join(workdir, "portfolio", ".scaffold-manifest.json"))
+
+def tmpfs_dir():
+    """Returns a tmpfs mount to benchmark on, or None."""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = {fields[1]: fields[2] for fields in (line.split() for line in f)}
+    except OSError:
+        return None
+    return "/dev/shm" if mounts.get("/dev/shm") == "tmpfs" and os.access("/dev/shm", os.W_OK) else None
+
+def describe_sources():
+    """Hashes and sizes every benchmarked script, to correlate results with template changes."""
+    sources = {}
+    for script, _, _ in TARGETS.values():
+        with open(os.path.join(HERE, script), "rb") as f:
+            data = f.read()
+        sources[script] = {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+    return sources
+
+def summarize(runs):
+    """Reduces repeated runs to medians/extremes; counts come from the last run."""
+    summary = {"median_wall_s": statistics.median(run["wall_s"] for run in runs),
+               "min_wall_s": min(run["wall_s"] for run in runs),
+               "max_peak_rss_kb": max(run["peak_rss_kb"] for run in runs)}
+    for key in ("files_written", "bytes_written", "dirs_created"):
+        summary[key] = runs[-1][key]
+    summary["syscalls"] = runs[-1]["syscalls"]
+    summary["cache"] = runs[-1]["cache"]
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the portfolio generators.")
+    parser.add_argument("--targets", nargs="+", choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per target, filesystem and state")
+    parser.add_argument("--disk-dir", default=tempfile.gettempdir(), help="directory on disk to run in")
+    parser.add_argument("--tmpfs-dir", default=tmpfs_dir(), help="directory on tmpfs to run in")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--child", nargs=2, metavar=("TARGET", "WORKDIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    filesystems = {"disk": args.disk_dir}
+    if args.tmpfs_dir:
+        filesystems["tmpfs"] = args.tmpfs_dir
+
+    results = []
+    for target in args.targets:
+        for fs, base in filesystems.items():
+            for state in ("cold", "warm"):
+                runs = []
+                for _ in range(args.repeat):
+                    workdir = tempfile.mkdtemp(prefix="portfolio-bench-", dir=base)
+                    try:
+                        prepare(target, workdir, state)
+                        runs.append(measure(target, workdir))
+                    finally:
+                        shutil.rmtree(workdir, ignore_errors=True)
+                results.append({"target": target, "fs": fs, "state": state, **summarize(runs), "runs": runs})
+                print(f"{target:18} {fs:5} {state:4} {results[-1]['median_wall_s'] * 1000:8.1f} ms", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sources": describe_sources(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Offline tools for the data directory of a generated portfolio (portfolio/data/).
+
+    python data_tools.py inspect
+    python data_tools.py --data-dir portfolio/data compact projects
+    python data_tools.py migrate
+    python data_tools.py import-sqlite
+    python data_tools.py shard
+    python data_tools.py category-index
+    python data_tools.py publish
+    python data_tools.py bundles
+
+With DATA_STORAGE=journal the generated lib/data.ts keeps each collection as a JSON
+snapshot (<name>.json) plus an append-only log of compact JSONL records
+(<name>.journal.jsonl): {"op": "put", "record": {...}} or {"op": "del", "id": "..."}.
+`inspect` summarizes snapshots and journals; `compact` folds each journal into its
+snapshot, as the server does once a log grows large.
+
+Every data file carries a `schemaVersion`. `migrate` upgrades older files once (legacy
+project `images` lists become galleries with stable ids), so the server no longer
+migrates records on every read.
+
+`import-sqlite` loads the current JSON records (journal applied, legacy projects
+migrated) into data/portfolio.db for DATA_STORAGE=sqlite, replacing what the tables held.
+`shard` writes them as data/<name>/<id>.json plus data/<name>.index.json for
+DATA_STORAGE=sharded. Both leave the JSON files in place.
+
+`category-index` writes data/category-index.json for the projects page: the id list,
+count and first page of card fields for "All" and every category. The page imports it
+at build time, so its filter bar needs no request to show counts or switch categories.
+The server rewrites it after each project edit and the page revalidates it on load, so
+this is only needed for data edited offline.
+
+`publish` is for read-only deployments (NEXT_PUBLIC_DATA_MODE=static). It writes each
+collection's records to public/data/<name>.<hash>.json, content-addressed so the files
+can be cached forever, records their URLs in data/published.json for the pages to
+import, and refreshes the category index. `python Code2.py --publish` runs it too.
+
+`bundles` writes data/bundles/projects/<id>.json, the single file a project page renders
+from: the record, its prev/next neighbours and its gallery with media types and YouTube
+ids, plus data/bundles/projects.version, a hash of the records they were built from. The
+server uses bundles only while that matches its live records, so after offline edits
+pages fall back to the records until this is rerun or the server commits an edit.
+
+Stop the server before compacting or migrating: like the server, the tool assumes it
+is the only writer.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from collections import Counter
+from contextlib import closing
+
+COLLECTIONS = ("projects", "experience")
+DEFAULT_DATA_DIR = os.path.join("portfolio", "data")
+SCHEMA_VERSION = 2  # keep in step with SCHEMA_VERSION in lib/storage.ts
+SQLITE_NAME = "portfolio.db"
+CATEGORY_INDEX_NAME = "category-index.json"
+PUBLISHED_NAME = "published.json"
+PUBLIC_DATA_DIR = os.path.join("portfolio", "public", "data")
+PAGE_SIZE = 12  # keep in step with PAGE_LIMIT in lib/data.ts
+RECORD_ID = re.compile(r"^[\w-]+$", re.ASCII)
+# Keep in step with YOUTUBE_ID in lib/data.ts.
+YOUTUBE_ID = re.compile(r"(?:youtube\.com/(?:[^/]+/.+/|(?:v|e(?:mbed)?)/|.*[?&]v=)|youtu\.be/)([^\"&?/\s]{11})")
+
+# Fields kept in the sharded index; keep in step with lib/data.ts (projectSummaryFields).
+INDEX_FIELDS = {
+    "projects": ("id", "order", "category", "title", "thumbnail", "tags"),
+    "experience": ("id", "order"),
+}
+
+# Keep in step with openDatabase() and sqliteCollection() in lib/storage.ts.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS {name} (
+  id TEXT PRIMARY KEY,
+  "order" INTEGER NOT NULL DEFAULT 0,
+  category TEXT,
+  data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS {name}_order ON {name} ("order");
+CREATE INDEX IF NOT EXISTS {name}_category ON {name} (category, "order");
+"""
+
+def snapshot_path(data_dir, name):
+    """Returns the snapshot file of a collection."""
+    return os.path.join(data_dir, f"{name}.json")
+
+def journal_path(data_dir, name):
+    """Returns the journal file of a collection."""
+    return os.path.join(data_dir, f"{name}.journal.jsonl")
+
+def read_document(data_dir, name):
+    """Returns the parsed snapshot file of a collection, or an empty one if it does not exist."""
+    try:
+        with open(snapshot_path(data_dir, name), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {name: []}
+
+def read_snapshot(data_dir, name):
+    """Returns the records of a collection's snapshot."""
+    return read_document(data_dir, name).get(name, [])
+
+def schema_version(document):
+    """Returns the schema version of a parsed data file; files without one are version 1."""
+    return document.get("schemaVersion", 1)
+
+def make_document(name, records, version=None):
+    """Returns a data file body in the key order lib/storage.ts writes."""
+    return {"schemaVersion": version, name: records} if version is not None else {name: records}
+
+def read_journal(path):
+    """
+    Returns (entries, torn) for a journal file.
+
+    `torn` is the number of bytes after the last newline: a record the server was
+    writing when it stopped, which it never applied and which is dropped here too.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    end = data.rfind(b"\n") + 1
+    entries = [json.loads(line) for line in data[:end].decode("utf-8").splitlines() if line]
+    return entries, len(data) - end
+
+def replay(records, entries):
+    """Applies journal entries to snapshot records; returns the records sorted by order."""
+    by_id = {record["id"]: record for record in records}
+    for entry in entries:
+        if entry["op"] == "put":
+            by_id[entry["record"]["id"]] = entry["record"]
+        elif entry["op"] == "del":
+            by_id.pop(entry["id"], None)
+        else:
+            raise ValueError(f"unknown journal op {entry['op']!r}")
+    return sorted(by_id.values(), key=lambda record: record.get("order", 0))
+
+def write_json(path, data):
+    """Writes JSON the way lib/storage.ts does (2-space indent), via a temp file and rename."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def compact(data_dir, name):
+    """Folds a collection's journal into its snapshot; returns (records, entries folded)."""
+    path = journal_path(data_dir, name)
+    entries, _ = read_journal(path)
+    document = read_document(data_dir, name)
+    if not entries and not os.path.exists(path):
+        return len(document.get(name, [])), 0
+    records = replay(document.get(name, []), entries)
+    write_json(snapshot_path(data_dir, name), make_document(name, records, document.get("schemaVersion")))
+    os.remove(path)
+    return len(records), len(entries)
+
+def media_type(url):
+    """Classifies a gallery URL the way the admin project form does."""
+    if "youtube.com" in url or "youtu.be" in url:
+        return "youtube"
+    return "gif" if url.endswith(".gif") else "image"
+
+def migrate_project(project):
+    """
+    Returns a project in the current format and whether it changed.
+
+    A legacy `images` list becomes a gallery whose item ids derive from the project id,
+    the same ids lib/data.ts assigns when it migrates an old file on read.
+    """
+    if "gallery" in project:
+        return project, False
+    migrated = {key: value for key, value in project.items() if key != "images"}
+    migrated["gallery"] = [{"id": f"{project['id']}-{index}", "url": url, "type": media_type(url)}
+                           for index, url in enumerate(project.get("images") or [])]
+    return migrated, True
+
+def migrate(data_dir, name):
+    """
+    Upgrades a collection's snapshot to SCHEMA_VERSION, folding its journal first.
+
+    Returns (records migrated, version before), or None if it was already current.
+    """
+    compact(data_dir, name)
+    document = read_document(data_dir, name)
+    version = schema_version(document)
+    if version >= SCHEMA_VERSION:
+        return None
+    records, migrated = document.get(name, []), 0
+    if name == "projects":
+        results = [migrate_project(project) for project in records]
+        records = [project for project, _ in results]
+        migrated = sum(changed for _, changed in results)
+    write_json(snapshot_path(data_dir, name), make_document(name, records, SCHEMA_VERSION))
+    return migrated, version
+
+def current_records(data_dir, name):
+    """Returns a collection's records with its journal applied and legacy projects migrated."""
+    document = read_document(data_dir, name)
+    entries, _ = read_journal(journal_path(data_dir, name))
+    records = replay(document.get(name, []), entries)
+    if name == "projects" and schema_version(document) < SCHEMA_VERSION:
+        records = [migrate_project(project)[0] for project in records]
+    return records
+
+def import_sqlite(data_dir, name, db_path):
+    """Replaces a collection's table in the SQLite store with its JSON records; returns the count."""
+    records = current_records(data_dir, name)
+    rows = [(record["id"], record.get("order", 0), record.get("category"),
+             json.dumps(record, ensure_ascii=False, separators=(",", ":"))) for record in records]
+    with closing(sqlite3.connect(db_path)) as db:
+        db.execute("PRAGMA journal_mode = WAL")
+        db.executescript(SQLITE_SCHEMA.format(name=name))
+        with db:
+            db.execute(f"DELETE FROM {name}")
+            db.executemany(f'INSERT INTO {name} (id, "order", category, data) VALUES (?, ?, ?, ?)', rows)
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schemaVersion', ?)", (str(SCHEMA_VERSION),))
+    return len(records)
+
+def shard(data_dir, name):
+    """Writes a collection as one file per record plus an index file; returns the record count."""
+    records = current_records(data_dir, name)
+    for record in records:
+        if not RECORD_ID.match(record["id"]):
+            raise ValueError(f"{name} id {record['id']!r} cannot be used as a file name")
+
+    record_dir = os.path.join(data_dir, name)
+    os.makedirs(record_dir, exist_ok=True)
+    for record in records:
+        write_json(os.path.join(record_dir, f"{record['id']}.json"), record)
+    index = [{field: record[field] for field in INDEX_FIELDS[name] if field in record} for record in records]
+    write_json(os.path.join(data_dir, f"{name}.index.json"), make_document(name, index, SCHEMA_VERSION))
+
+    current = {f"{record['id']}.json" for record in records}
+    for filename in os.listdir(record_dir):
+        if filename.endswith(".json") and filename not in current:
+            os.remove(os.path.join(record_dir, filename))
+    return len(records)
+
+def category_index(data_dir, page_size=PAGE_SIZE):
+    """Returns the projects grouped by category with counts and first pages of card fields."""
+    records = current_records(data_dir, "projects")
+    groups = {"All": records}
+    for category in sorted({record["category"] for record in records if record.get("category")}):
+        groups[category] = [record for record in records if record.get("category") == category]
+
+    categories = []
+    for category, members in groups.items():
+        first_page = [{field: record[field] for field in INDEX_FIELDS["projects"] if field in record}
+                      for record in members[:page_size]]
+        categories.append({
+            "name": category,
+            "count": len(members),
+            "ids": [record["id"] for record in members],
+            "firstPage": first_page,
+            "nextCursor": first_page[-1].get("order", 0) if len(members) > page_size else None,
+        })
+    return {"pageSize": page_size, "categories": categories}
+
+def publish(data_dir, public_dir=PUBLIC_DATA_DIR):
+    """
+    Writes every collection as an immutable, content-hashed file under `public_dir`.
+
+    Returns {name: url}, which is also written to data/published.json; hashed files of
+    earlier publishes are removed. The category index is rebuilt from the same records.
+    """
+    os.makedirs(public_dir, exist_ok=True)
+    urls = {}
+    for name in COLLECTIONS:
+        body = json.dumps(current_records(data_dir, name), ensure_ascii=False, separators=(",", ":"))
+        filename = f"{name}.{hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]}.json"
+        path = os.path.join(public_dir, filename)
+        if not os.path.exists(path):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        for old in os.listdir(public_dir):
+            if re.fullmatch(rf"{name}\.[0-9a-f]{{16}}\.json", old) and old != filename:
+                os.remove(os.path.join(public_dir, old))
+        urls[name] = f"/data/{filename}"
+    write_json(os.path.join(data_dir, PUBLISHED_NAME), urls)
+    write_json(os.path.join(data_dir, CATEGORY_INDEX_NAME), category_index(data_dir))
+    return urls
+
+def make_bundle(projects, index):
+    """Returns the page bundle of projects[index]; keep in step with makeBundle() in lib/data.ts."""
+    project = projects[index]
+    link = lambda other: {"id": other["id"], "title": other["title"]}
+    media = []
+    for item in project.get("gallery") or []:
+        kind = media_type(item["url"])
+        match = YOUTUBE_ID.search(item["url"]) if kind == "youtube" else None
+        media.append({**item, "type": kind, "youtubeId": match.group(1) if match else None})
+    return {
+        "project": project,
+        "prev": link(projects[index - 1]) if index > 0 else None,
+        "next": link(projects[index + 1]) if index + 1 < len(projects) else None,
+        "media": media,
+    }
+
+def records_version(records):
+    """Returns the version bundles record for `records`; keep in step with recordsVersion() in lib/data.ts."""
+    body = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def write_bundles(data_dir):
+    """Rewrites every project page bundle and removes stale ones; returns the count."""
+    projects = sorted(current_records(data_dir, "projects"), key=lambda project: project.get("order", 0))
+    for project in projects:
+        if not RECORD_ID.match(project["id"]):
+            raise ValueError(f"projects id {project['id']!r} cannot be used as a file name")
+
+    bundle_dir = os.path.join(data_dir, "bundles", "projects")
+    version_path = f"{bundle_dir}.version"
+    os.makedirs(bundle_dir, exist_ok=True)
+    if os.path.exists(version_path):
+        os.remove(version_path)
+    for index, project in enumerate(projects):
+        path = os.path.join(bundle_dir, f"{project['id']}.json")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(make_bundle(projects, index), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    current = {f"{project['id']}.json" for project in projects}
+    for filename in os.listdir(bundle_dir):
+        if filename.endswith(".json") and filename not in current:
+            os.remove(os.path.join(bundle_dir, filename))
+    tmp = f"{version_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(records_version(projects))
+    os.replace(tmp, version_path)
+    return len(projects)
+
+def inspect(data_dir, name):
+    """Prints the size of a collection's snapshot and journal and what the journal holds."""
+    snapshot = read_snapshot(data_dir, name)
+    entries, torn = read_journal(journal_path(data_dir, name))
+    sizes = [os.path.getsize(p) if os.path.exists(p) else 0
+             for p in (snapshot_path(data_dir, name), journal_path(data_dir, name))]
+    ops = Counter(entry["op"] for entry in entries)
+    touched = {entry["record"]["id"] if entry["op"] == "put" else entry["id"] for entry in entries}
+
+    print(f"📦 {name}")
+    print(f"  snapshot: {len(snapshot)} records, {sizes[0]} bytes, "
+          f"schema v{schema_version(read_document(data_dir, name))}")
+    print(f"  journal:  {len(entries)} entries ({ops['put']} put, {ops['del']} del), "
+          f"{len(touched)} records touched, {sizes[1]} bytes")
+    if torn:
+        print(f"  ⚠ {torn} bytes of an unfinished entry at the end of the journal")
+    print(f"  current:  {len(replay(snapshot, entries))} records")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and maintain the portfolio's data files.")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="data directory of the generated portfolio")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    commands = {}
+    for command, help_text in (("inspect", "summarize snapshots and journals"),
+                               ("compact", "fold journals into their snapshots"),
+                               ("migrate", f"upgrade data files to schema v{SCHEMA_VERSION}"),
+                               ("import-sqlite", "load the JSON records into the SQLite store"),
+                               ("shard", "write the JSON records as per-record files plus an index")):
+        commands[command] = subparsers.add_parser(command, help=help_text)
+        commands[command].add_argument("collections", nargs="*", default=list(COLLECTIONS), metavar="COLLECTION",
+                                       help="projects and/or experience (default: both)")
+    commands["import-sqlite"].add_argument("--db", help=f"database file (default: DATA_DIR/{SQLITE_NAME})")
+    index_parser = subparsers.add_parser("category-index", help="write per-category counts and first pages of projects")
+    index_parser.add_argument("--out", help=f"output file (default: DATA_DIR/{CATEGORY_INDEX_NAME})")
+    index_parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="projects per first page")
+    index_parser.set_defaults(collections=[])
+    publish_parser = subparsers.add_parser("publish", help="write hashed static JSON for read-only deployments")
+    publish_parser.add_argument("--public-dir", default=PUBLIC_DATA_DIR,
+                                help="directory served as /data/ (default: portfolio/public/data)")
+    publish_parser.set_defaults(collections=[])
+    subparsers.add_parser("bundles", help="write the per-project page bundles").set_defaults(collections=[])
+    args = parser.parse_args()
+    unknown = sorted(set(args.collections) - set(COLLECTIONS))
+    if unknown:
+        parser.error(f"unknown collection {unknown[0]!r} (choose from {', '.join(COLLECTIONS)})")
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: no data directory at {args.data_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        if args.command == "category-index":
+            out = args.out or os.path.join(args.data_dir, CATEGORY_INDEX_NAME)
+            index = category_index(args.data_dir, max(args.page_size, 1))
+            write_json(out, index)
+            counts = ", ".join(f"{entry['name']} {entry['count']}" for entry in index["categories"])
+            print(f"✓ wrote {out}: {counts}")
+        elif args.command == "bundles":
+            print(f"✓ projects: wrote {write_bundles(args.data_dir)} page bundles")
+        elif args.command == "publish":
+            for name, url in publish(args.data_dir, args.public_dir).items():
+                print(f"✓ {name}: {url}")
+        for name in args.collections:
+            if args.command == "inspect":
+                inspect(args.data_dir, name)
+            elif args.command == "compact":
+                records, folded = compact(args.data_dir, name)
+                print(f"✓ {name}: folded {folded} journal entries, {records} records")
+            elif args.command == "import-sqlite":
+                db_path = args.db or os.path.join(args.data_dir, SQLITE_NAME)
+                print(f"✓ {name}: imported {import_sqlite(args.data_dir, name, db_path)} records into {db_path}")
+            elif args.command == "shard":
+                print(f"✓ {name}: wrote {shard(args.data_dir, name)} record files and {name}.index.json")
+            else:
+                result = migrate(args.data_dir, name)
+                if result is None:
+                    print(f"= {name}: already at schema v{SCHEMA_VERSION}")
+                else:
+                    print(f"✓ {name}: schema v{result[1]} → v{SCHEMA_VERSION}, {result[0]} records migrated")
+    except OSError as e:
+        print(f"Error accessing {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"Error: SQLite: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (ValueError, KeyError) as e:
+        print(f"Error: malformed data file: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
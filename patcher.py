@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Batched patch engine for portfolio fix scripts.
+
+A fix script describes its changes as a list of edits returned by a `fixes()` function
+instead of writing files itself. The engine loads a queue of fix scripts, folds all of
+their edits per file in memory (each file is read at most once), and writes every
+touched file exactly once - or not at all when the folded result hashes the same as
+what is already on disk.
+
+    python patcher.py "Modefication 1.py" "Modefication 2.py"
+
+Edits to generated files should be patches: anchored hunks applied to the template the
+file was generated from (the base), then three-way merged with the file on disk. Regions
+the fix does not touch stay byte-identical, local edits elsewhere in the file survive,
+and a fix that collides with a local edit is reported as a conflict instead of
+overwriting it.
+
+Older scripts that only call a module-level create_file(path, content) are still
+supported: their create_file is swapped for a recorder before their entry point runs.
+"""
+
+import argparse
+import difflib
+import importlib.util
+import os
+import sys
+from collections import namedtuple
+
+from registry import object_path, read_object, render_only
+from scaffold import content_hash, emit_files, load_manifest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+Edit = namedtuple("Edit", "kind path content")
+Hunk = namedtuple("Hunk", "old new anchor")
+
+class MergeConflict(ValueError):
+    """A patch and a local edit changed the same region of a file."""
+
+def write(path, content):
+    """Replaces a whole file."""
+    return Edit("write", path, content)
+
+def create(path, content):
+    """Creates a file only if it does not exist yet."""
+    return Edit("create", path, content)
+
+def hunk(old, new, anchor=None):
+    """
+    Replaces `old` with `new`. `old` must occur exactly once in the base template, or
+    exactly once after the first occurrence of `anchor`; None replaces the whole base.
+    """
+    return Hunk(old, new, anchor)
+
+def patch(path, hunks, generator="Code2.py", root="portfolio"):
+    """Applies hunks to the generator's template for `path` and merges them into the file."""
+    return Edit("patch", path, (hunks, generator, root))
+
+def base_template(path, generator, root):
+    """
+    Returns the template a generated file was created from.
+
+    The tree's manifest records the template hash of every file, and the registry keeps
+    each template body it has seen by hash, so the exact original is used when it is
+    still in the store. Otherwise the generator's current template is the base.
+    """
+    generator = os.path.join(HERE, generator)
+    digest = load_manifest(root).get(path[len(root) + 1:])
+    if digest and os.path.exists(object_path(generator, digest)):
+        return read_object(generator, digest)
+    return render_only(generator, [path], root)[path]
+
+def apply_hunks(base, hunks, path):
+    """Returns `base` with every hunk applied."""
+    result = base
+    for h in hunks:
+        if h.old is None:
+            result = h.new
+            continue
+        start = 0
+        if h.anchor is not None:
+            start = result.find(h.anchor)
+            if start < 0:
+                raise ValueError(f"{path}: anchor {h.anchor!r} not found in the base template")
+        at = result.find(h.old, start)
+        if at < 0 or result.find(h.old, at + 1) >= 0:
+            raise ValueError(f"{path}: hunk {h.old.splitlines()[0]!r} does not match exactly once")
+        result = result[:at] + h.new + result[at + len(h.old):]
+    return result
+
+def changed_regions(base, other):
+    """Returns (start, end, replacement) for every base line range that `other` changes."""
+    matcher = difflib.SequenceMatcher(None, base, other, autojunk=False)
+    return [(i1, i2, other[j1:j2]) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+
+def apply_regions(base, lo, hi, regions):
+    """Applies one side's changes to base[lo:hi]."""
+    result, pos = [], lo
+    for start, end, replacement in regions:
+        result += base[pos:start] + replacement
+        pos = end
+    return result + base[pos:hi]
+
+def merge3(base, ours, theirs, path):
+    """
+    Line-based three-way merge of two descendants of `base`.
+
+    Changes from either side that touch disjoint regions of the base are combined;
+    overlapping or adjacent changes must be identical, otherwise MergeConflict is raised.
+    """
+    if ours == base or ours == theirs:
+        return theirs
+    if theirs == base:
+        return ours
+    base_lines = base.splitlines(keepends=True)
+    ours_lines = ours.splitlines(keepends=True)
+    theirs_lines = theirs.splitlines(keepends=True)
+    changes = sorted([(start, end, 0, repl) for start, end, repl in changed_regions(base_lines, ours_lines)] +
+                     [(start, end, 1, repl) for start, end, repl in changed_regions(base_lines, theirs_lines)])
+
+    # Group changes that overlap or touch into clusters.
+    clusters = []
+    for change in changes:
+        if clusters and change[0] <= clusters[-1][1]:
+            clusters[-1][1] = max(clusters[-1][1], change[1])
+            clusters[-1][2].append(change)
+        else:
+            clusters.append([change[0], change[1], [change]])
+
+    merged, pos = [], 0
+    for lo, hi, cluster in clusters:
+        merged += base_lines[pos:lo]
+        sides = [[(start, end, repl) for start, end, side, repl in cluster if side == i] for i in (0, 1)]
+        ours_part = apply_regions(base_lines, lo, hi, sides[0])
+        theirs_part = apply_regions(base_lines, lo, hi, sides[1])
+        if sides[0] and sides[1] and ours_part != theirs_part:
+            raise MergeConflict(f"{path}: local edits conflict with the patch around line {lo + 1}")
+        merged += theirs_part if sides[1] else ours_part
+        pos = hi
+    return "".join(merged + base_lines[pos:])
+
+def apply_edit(current, edit):
+    """Returns the content of a file after one edit; `current` is None for a missing file."""
+    if edit.kind == "write":
+        return edit.content
+    if edit.kind == "create":
+        return edit.content if current is None else current
+    if edit.kind == "patch":
+        hunks, generator, root = edit.content
+        base = base_template(edit.path, generator, root)
+        theirs = apply_hunks(base, hunks, edit.path)
+        return theirs if current is None else merge3(base, current, theirs, edit.path)
+    raise ValueError(f"Unknown edit kind {edit.kind!r} for {edit.path}")
+
+def read_text(path):
+    """Returns a file's content, or None if it does not exist."""
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def fold_edits(edits):
+    """
+    Applies a sequence of edits in memory.
+
+    Returns ({path: (original, result)}, conflicts): the on-disk content before the first
+    edit and the content after the last one. A file with a merge conflict keeps its
+    original content and is listed in `conflicts`; its later edits are skipped.
+    """
+    files, conflicts = {}, {}
+    for edit in edits:
+        if edit.path in conflicts:
+            continue
+        if edit.path not in files:
+            original = read_text(edit.path)
+            files[edit.path] = (original, original)
+        original, current = files[edit.path]
+        try:
+            files[edit.path] = (original, apply_edit(current, edit))
+        except MergeConflict as e:
+            conflicts[edit.path] = str(e)
+            files[edit.path] = (original, original)
+    return files, conflicts
+
+def load_script(path):
+    """Imports a fix script by path; its name may contain spaces."""
+    name = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def collect_edits(path):
+    """Returns the edits of one fix script without touching the filesystem."""
+    module = load_script(path)
+    if hasattr(module, "fixes"):
+        return list(module.fixes())
+
+    entry = next((getattr(module, name) for name in dir(module)
+                  if name == "main" or name.startswith("fix_")), None)
+    if entry is None or not hasattr(module, "create_file"):
+        raise ValueError(f"{path} has neither fixes() nor a create_file-based entry point")
+    edits = []
+    module.create_file = lambda filepath, content: edits.append(write(filepath, content))
+    entry()
+    return edits
+
+def apply_edits(edits, dry_run=False):
+    """
+    Folds edits per file and writes each changed file once.
+
+    Returns (written, unchanged, conflicts): two path lists and {path: message} for files
+    left alone because a patch collided with local edits. Nothing is written with `dry_run`.
+    """
+    folded, conflicts = fold_edits(edits)
+    changed = {path: result for path, (original, result) in folded.items()
+               if result is not None and (original is None or content_hash(original) != content_hash(result))}
+    if changed and not dry_run:
+        emit_files(changed)
+    unchanged = [path for path in folded if path not in changed and path not in conflicts]
+    return list(changed), unchanged, conflicts
+
+def report(written, unchanged, conflicts):
+    """Prints the outcome of a batch."""
+    for path in written:
+        print(f"✓ Fixed: {path}")
+    for path in unchanged:
+        print(f"= Unchanged: {path}")
+    for message in conflicts.values():
+        print(f"✗ Conflict: {message}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a queue of fix scripts with one write per file.")
+    parser.add_argument("scripts", nargs="+", help="fix scripts, applied in order")
+    parser.add_argument("--dry-run", action="store_true", help="show what would be written")
+    args = parser.parse_args()
+
+    edits = []
+    for script in args.scripts:
+        try:
+            script_edits = collect_edits(script)
+        except (OSError, ValueError) as e:
+            print(f"Error loading {script}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"🔧 {script}: {len(script_edits)} edits")
+        edits.extend(script_edits)
+
+    try:
+        written, unchanged, conflicts = apply_edits(edits, dry_run=args.dry_run)
+    except OSError as e:
+        print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    report(written, unchanged, conflicts)
+    print(f"\n{'⚠️' if conflicts else '✅'} {len(edits)} edits, {len(written)} files written, "
+          f"{len(unchanged)} unchanged, {len(conflicts)} conflicts.")
+    if conflicts:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
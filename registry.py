@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Lazy template registry - renders single generator templates without building the whole dict.
+
+The templates of a generator live as string literals inside its build_*_files() functions.
+The registry parses a generator once and stores every rendered template body in a
+content-addressed object store under .scaffold-cache/objects/, shared by all generators:
+a body that is byte-identical in Code.py and Code2.py is stored (and loaded) once. Each
+generator becomes a small variant manifest of path -> hash, cached next to the store and
+validated against the generator's size and mtime. Conflicting duplicate keys in a
+generator's dicts are rejected while the manifest is built. SCAFFOLD_CACHE_DIR moves the
+cache elsewhere, e.g. into a benchmark's working directory.
+
+A key "<path>#<name>" holds an alternative body for <path> (Code2's --projects-page
+server page, say). Asking for <path> renders its alternatives too, and the generator's
+apply_options() picks one before anything is written.
+
+    python registry.py Code2.py components/3d/FloorGrid.tsx
+    python registry.py Code.py --diff Code2.py
+    python registry.py Code2.py --watch
+"""
+
+import argparse
+import ast
+import ctypes
+import ctypes.util
+import importlib.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+from scaffold import DEFAULT_WORKERS, content_hash, load_options, relative_path, update_tree
+
+CACHE_DIR = ".scaffold-cache"
+MANIFEST_VERSION = 2
+
+# Object bodies already read by this process, keyed by hash.
+_objects = {}
+
+# inotify(7) event masks used by the watcher.
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+WATCH_SETTLE = 0.05  # seconds to wait for an editor to finish a burst of writes
+
+def cache_dir(source):
+    """Returns the cache directory shared by the generators next to `source`, or SCAFFOLD_CACHE_DIR."""
+    return os.environ.get("SCAFFOLD_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIR)
+
+def cache_path(source, suffix):
+    """Returns the cache file for a generator source."""
+    return os.path.join(cache_dir(source), os.path.splitext(os.path.basename(source))[0] + suffix)
+
+def object_path(source, digest):
+    """Returns the store path of a template body, fanned out by hash prefix."""
+    return os.path.join(cache_dir(source), "objects", digest[:2], digest[2:])
+
+def source_stamp(source):
+    """Returns the (size, mtime_ns) pair used to validate cached manifests."""
+    st = os.stat(source)
+    return [st.st_size, st.st_mtime_ns]
+
+def template_nodes(tree):
+    """Yields (builder name, key node, value node) for every template literal in build_*_files()."""
+    for func in tree.body:
+        if not (isinstance(func, ast.FunctionDef) and func.name.startswith("build_") and func.name.endswith("_files")):
+            continue
+        for node in ast.walk(func):
+            if not isinstance(node, ast.Dict):
+                continue
+            for key, value in zip(node.keys, node.values):
+                if isinstance(key, ast.Constant) and isinstance(key.value, str):
+                    yield func.name, key, value
+
+def render_node(source, node):
+    """Returns the rendered body of a template literal node."""
+    if not (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+        raise ValueError(f"{source}:{node.lineno}: template is not a plain string literal")
+    return node.value.strip()
+
+def parse_templates(source):
+    """
+    Parses a generator and returns {path: rendered content} of its template literals.
+
+    A path defined twice with different bodies is a ValueError, since the later entry
+    would silently replace the earlier one.
+    """
+    with open(source, "rb") as f:
+        tree = ast.parse(f.read(), filename=source)
+    templates, lines = {}, {}
+    for _, key, value in template_nodes(tree):
+        content = render_node(source, value)
+        if key.value in templates and templates[key.value] != content:
+            raise ValueError(f"{source}:{key.lineno}: conflicting duplicate template {key.value} "
+                             f"(first defined on line {lines[key.value]})")
+        templates[key.value] = content
+        lines.setdefault(key.value, key.lineno)
+    return templates
+
+def put_object(source, content):
+    """Adds a template body to the shared store and returns its hash."""
+    digest = content_hash(content)
+    path = object_path(source, digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content.encode("utf-8"))
+        os.replace(tmp, path)
+    _objects[digest] = content
+    return digest
+
+def build_variant(source):
+    """Stores every template of a generator and returns its {path: hash} manifest."""
+    return {path: put_object(source, content) for path, content in parse_templates(source).items()}
+
+def load_variant(source):
+    """Returns the variant manifest of a generator, rebuilding the cached copy if it is stale."""
+    stamp = source_stamp(source)
+    path = cache_path(source, ".manifest.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["version"] == MANIFEST_VERSION and cached["stamp"] == stamp:
+            return cached["templates"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    templates = build_variant(source)
+    os.makedirs(cache_dir(source), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": MANIFEST_VERSION, "stamp": stamp, "templates": templates}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+    return templates
+
+def read_object(source, digest):
+    """Returns a template body from the store, reading each hash at most once per process."""
+    if digest not in _objects:
+        with open(object_path(source, digest), "rb") as f:
+            _objects[digest] = f.read().decode("utf-8")
+    return _objects[digest]
+
+def diff_variants(old, new):
+    """Compares two variant manifests; returns (added, removed, changed) path lists."""
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(path for path in set(old) & set(new) if old[path] != new[path])
+    return added, removed, changed
+
+def resolve(variant, path, root="portfolio"):
+    """Maps 'components/3d/FloorGrid.tsx' or 'portfolio/components/...' to a manifest key."""
+    key = path if path.startswith(root.rstrip("/") + "/") else f"{root}/{path}"
+    if key not in variant:
+        raise KeyError(path)
+    return key
+
+def render_only(source, paths, root="portfolio"):
+    """Renders just the requested templates of a generator, keyed by output path."""
+    variant = load_variant(source)
+    files = {}
+    for path in paths:
+        key = resolve(variant, path, root)
+        for name in variant:
+            if name == key or name.startswith(key + "#"):
+                files[name] = read_object(source, variant[name])
+    return files
+
+def report_emitted(files, changed, conflicts):
+    """Prints what happened to each re-emitted template."""
+    for path in files:
+        if path in conflicts:
+            print(f"  ⚠ {path} was edited locally; left as is", file=sys.stderr)
+        else:
+            print(f"  {'✎' if path in changed else '='} {path}")
+
+def option_renderer(source, root):
+    """
+    Returns a function that applies the options `root` was generated with (recorded in
+    its manifest, else the defaults) to rendered templates, via the generator's
+    apply_options(). Generators without one pass templates through as is.
+    """
+    options = load_options(root)
+    name = "_generator_" + os.path.splitext(os.path.basename(source))[0].replace(" ", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.abspath(source))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "apply_options"):
+        return lambda files: files
+    return lambda files: module.apply_options(files, **options)
+
+def emit_only(source, paths, root="portfolio", workers=DEFAULT_WORKERS):
+    """Re-emits single templates into an existing tree and records them in its manifest."""
+    try:
+        files = option_renderer(source, root)(render_only(source, paths, root))
+    except KeyError as e:
+        print(f"Error: no template for {e.args[0]} in {source}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        changed, _, conflicts, _ = update_tree(files, root, workers=workers, partial=True)
+    except OSError as e:
+        print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+        sys.exit(1)
+    report_emitted(files, changed, conflicts)
+
+def line_offsets(data):
+    """Returns the byte offset at which each line of `data` starts."""
+    starts = [0]
+    for line in data.splitlines(keepends=True):
+        starts.append(starts[-1] + len(line))
+    return starts
+
+def template_spans(source):
+    """Returns {path: (raw literal bytes, value node)} for every template in a generator."""
+    with open(source, "rb") as f:
+        data = f.read()
+    tree = ast.parse(data, filename=source)
+    starts = line_offsets(data)
+    spans = {}
+    for _, key, value in template_nodes(tree):
+        start = starts[value.lineno - 1] + value.col_offset
+        end = starts[value.end_lineno - 1] + value.end_col_offset
+        spans[key.value] = (data[start:end], value)
+    return spans
+
+def source_changes(source):
+    """Yields each time `source` is saved, using inotify on Linux and mtime polling elsewhere."""
+    directory, name = os.path.split(os.path.abspath(source))
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    fd = libc.inotify_init1(os.O_CLOEXEC) if hasattr(libc, "inotify_init1") else -1
+    if fd < 0:
+        stamp = source_stamp(source)
+        while True:
+            time.sleep(0.5)
+            if source_stamp(source) != stamp:
+                stamp = source_stamp(source)
+                yield
+    # Watch the directory, not the file: editors often save by renaming a new file over it.
+    if libc.inotify_add_watch(fd, directory.encode(), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+        raise OSError(ctypes.get_errno(), "inotify_add_watch failed", directory)
+    try:
+        while True:
+            select.select([fd], [], [])
+            time.sleep(WATCH_SETTLE)
+            data = os.read(fd, 64 * 1024)
+            names, offset = set(), 0
+            while offset < len(data):
+                _, _, _, length = struct.unpack_from("iIII", data, offset)
+                names.add(data[offset + 16:offset + 16 + length].rstrip(b"\0").decode())
+                offset += 16 + length
+            if name in names:
+                yield
+    finally:
+        os.close(fd)
+
+def watch_templates(source, root="portfolio", workers=DEFAULT_WORKERS):
+    """
+    Re-emits templates as they are edited in a generator, until interrupted.
+
+    On every save the generator is re-parsed (never executed) and the raw source span of
+    each template literal is compared with the previous one. Only entries whose span
+    changed are rendered and written, so `next dev` hot-reloads just those modules.
+    """
+    spans = template_spans(source)
+    apply_options = option_renderer(source, root)
+    print(f"👀 Watching {source} ({len(spans)} templates) - Ctrl+C to stop")
+    try:
+        for _ in source_changes(source):
+            try:
+                current = template_spans(source)
+                files = apply_options({path: render_node(source, node) for path, (raw, node) in current.items()
+                                       if path not in spans or spans[path][0] != raw})
+            except (SyntaxError, ValueError) as e:
+                print(f"  ⚠ {e}; waiting for the next save", file=sys.stderr)
+                continue
+            for path in sorted(set(spans) - set(current)):
+                print(f"  - {path} is no longer generated; left in place")
+            spans = current
+            if not files:
+                continue
+            try:
+                changed, _, conflicts, _ = update_tree(files, root, workers=workers, partial=True)
+            except OSError as e:
+                print(f"Error writing file {e.filename}: {e}", file=sys.stderr)
+                continue
+            report_emitted(files, changed, conflicts)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+
+def print_diff(source, other):
+    """Prints which templates differ between two generator variants."""
+    added, removed, changed = diff_variants(load_variant(source), load_variant(other))
+    for marker, paths in (("+", added), ("-", removed), ("~", changed)):
+        for path in paths:
+            print(f"{marker} {path}")
+    print(f"{len(added)} added, {len(removed)} removed, {len(changed)} changed")
+
+def main():
+    parser = argparse.ArgumentParser(description="Render individual templates of a portfolio generator.")
+    parser.add_argument("source", help="generator script, e.g. Code2.py")
+    parser.add_argument("paths", nargs="*", help="output paths relative to portfolio/")
+    parser.add_argument("--stdout", action="store_true", help="print the rendered templates instead of writing them")
+    parser.add_argument("--diff", metavar="OTHER", help="list templates that differ from another generator")
+    parser.add_argument("--watch", action="store_true", help="re-emit templates as they are edited in the generator")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch_templates(args.source)
+        return
+    if not args.diff and not args.paths:
+        parser.error("no template paths given")
+    if not args.diff and not args.stdout:
+        emit_only(args.source, args.paths)
+        return
+
+    try:
+        if args.diff:
+            print_diff(args.source, args.diff)
+            return
+        files = render_only(args.source, args.paths)
+    except KeyError as e:
+        print(f"Error: no template for {e.args[0]} in {args.source}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for path, content in files.items():
+        if len(files) > 1:
+            print(f"==> {relative_path(path, 'portfolio')} <==")
+        print(content)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the portfolio scaffold generators (Code.py, Code2.py).
+"""
+
+import errno
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+MANIFEST_NAME = ".scaffold-manifest.json"
+DEFAULT_WORKERS = 8
+ARCHIVE_FORMATS = ("tar", "tar.gz", "zip")
+ZIP_EPOCH = 315532800  # 1980-01-01, the earliest timestamp a zip entry can hold
+# Seed files the running app owns once generated (relative to the root); they are only
+# ever created, never overwritten.
+SEED_DIRS = ("data/",)
+
+def content_hash(content):
+    """Returns the SHA-256 hex digest of rendered file content."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+def file_hash(path):
+    """Returns the SHA-256 hex digest of a file on disk, or None if it is missing."""
+    try:
+        with open(path, "rb") as f:
+            return content_hash(f.read())
+    except OSError:
+        return None
+
+def relative_path(path, root):
+    """Strips the output root from a generator path ('portfolio/lib/data.ts' -> 'lib/data.ts')."""
+    prefix = root.rstrip("/") + "/"
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+def load_manifest(root):
+    """Loads the relative path -> hash manifest of a generated tree, or {} if there is none."""
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)["files"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def load_options(root):
+    """Loads the generator options a tree was rendered with, or {} if none were recorded."""
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f).get("options", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def save_manifest(root, files, base=None, options=None):
+    """
+    Records the hash of every rendered file so later runs can skip unchanged ones, and
+    the generator options (e.g. the storage backend) the files were rendered with.
+    """
+    hashes = dict(base or {})
+    hashes.update({relative_path(path, root): content_hash(content) for path, content in files.items()})
+    manifest = {"version": 1, "files": hashes}
+    if options:
+        manifest["options"] = options
+    with open(os.path.join(root, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def is_seed(path, root):
+    """Whether a generator path is a create-only seed file (see SEED_DIRS)."""
+    return relative_path(path, root).startswith(SEED_DIRS)
+
+def plan_sync(files, root, partial=False, force=False):
+    """
+    Compares rendered files against the manifest of an existing tree.
+
+    Returns (changed, stale, held): the subset of `files` that must be rewritten, the
+    paths that were generated by a previous run but are no longer rendered, and
+    {path: reason} for rendered files left as they are on disk. Files whose manifest hash
+    matches are skipped without being opened, so their mtimes are kept. A file edited
+    since it was generated (its bytes no longer match the manifest), or one that differs
+    from the render and has no manifest entry (trees generated before manifests existed),
+    is held as a "conflict" instead of being overwritten unless `force` is set; an
+    existing seed file is always held as "seed". Stale files that were edited locally
+    are left alone and not reported. A `partial` render covers only some templates, so
+    it never reports stale files.
+    """
+    manifest = load_manifest(root)
+    changed, held = {}, {}
+    for path, content in files.items():
+        digest = content_hash(content)
+        recorded = manifest.get(relative_path(path, root))
+        if recorded == digest and os.path.exists(path):
+            continue
+        on_disk = file_hash(path)
+        if on_disk == digest:
+            continue
+        if on_disk is not None and is_seed(path, root):
+            held[path] = "seed"
+        elif on_disk is not None and on_disk != recorded and not force:
+            held[path] = "conflict"
+        else:
+            # Missing, untouched since the last run, or overwritten on request.
+            changed[path] = content
+    if partial:
+        return changed, [], held
+
+    rendered = {relative_path(path, root) for path in files}
+    stale = []
+    for rel, digest in sorted(manifest.items()):
+        path = os.path.join(root, rel)
+        if rel not in rendered and file_hash(path) == digest:
+            stale.append(path)
+    return changed, stale, held
+
+def leaf_directories(paths):
+    """Returns the deepest unique parent directories of `paths`; creating these creates the rest."""
+    directories = {os.path.dirname(path) for path in paths} - {""}
+    return sorted(d for d in directories if not any(other.startswith(d + "/") for other in directories))
+
+def _write_timed(item):
+    path, content = item
+    data = content.encode("utf-8")
+    start = time.perf_counter()
+    with open(path, "wb") as f:
+        f.write(data)
+    return path, time.perf_counter() - start, len(data)
+
+def emit_files(files, workers=DEFAULT_WORKERS):
+    """
+    Writes rendered files through a bounded thread pool.
+
+    The directory set is computed once and created in a single pass before any file is
+    opened, so workers only open and write. Returns (path, seconds, bytes) per file in
+    input order; the first OSError raised by a worker propagates to the caller.
+    """
+    for directory in leaf_directories(files):
+        os.makedirs(directory, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(_write_timed, files.items()))
+
+def report_timings(timings, elapsed):
+    """Prints per-file write timings, slowest first."""
+    total_bytes = sum(size for _, _, size in timings)
+    print(f"\n⏱  {len(timings)} files, {total_bytes} bytes in {elapsed * 1000:.1f} ms")
+    for path, seconds, size in sorted(timings, key=lambda t: t[1], reverse=True):
+        print(f"  {seconds * 1000:8.2f} ms  {size:7d} B  {path}")
+
+@contextmanager
+def staging_directory(root):
+    """Yields an empty sibling of `root` to render into; whatever is left in it is deleted on exit."""
+    parent, name = os.path.split(os.path.abspath(root))
+    staging = os.path.join(parent, f".{name}.staging-{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.mkdir(staging)
+    try:
+        yield staging
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+def rebase(files, root, new_root):
+    """Re-keys generator paths from `root` onto `new_root`."""
+    return {os.path.join(new_root, relative_path(path, root)): content for path, content in files.items()}
+
+def build_tree(files, root, directories=(), workers=DEFAULT_WORKERS, options=None):
+    """
+    Generates a complete tree in a staging sibling and moves it into place with one rename.
+
+    `root` only ever appears fully written: if any file fails, the staging directory is
+    discarded and the error propagates. `options` are recorded in the manifest. Returns
+    the emit timings keyed by generator path.
+    """
+    with staging_directory(root) as staging:
+        staged = rebase(files, root, staging)
+        timings = emit_files(staged, workers)
+        for directory in directories:
+            os.makedirs(os.path.join(staging, relative_path(directory, root)), exist_ok=True)
+        save_manifest(staging, staged, options=options)
+        if os.path.exists(root):
+            raise FileExistsError(errno.EEXIST, "Output directory appeared during generation", root)
+        os.rename(staging, root)
+    return [(path, seconds, size) for path, (_, seconds, size) in zip(files, timings)]
+
+def update_tree(files, root, workers=DEFAULT_WORKERS, partial=False, options=None, force=False, carriers=None):
+    """
+    Brings an existing tree up to date with one rename per changed file.
+
+    Changed files are written to a staging sibling first, so an aborted run leaves `root`
+    untouched, and a watcher on `root` sees a single short burst of replacements. With
+    `partial`, `files` is a subset of the templates and is merged into the manifest.
+    Held files (see plan_sync; `force` overwrites conflicts) are not written and keep their previous manifest entry,
+    so a conflict is reported again until it is resolved. `options` replace the recorded
+    generator options; None keeps them. `carriers` maps an option to the generator path
+    that renders it: while that file is held, the option keeps its recorded value, so the
+    manifest never claims an option the tree does not have.
+    Returns (changed, stale, conflicts, timings).
+    """
+    changed, stale, held = plan_sync(files, root, partial, force)
+    manifest = load_manifest(root)
+    previous = load_options(root)
+    if options is None:
+        options = previous
+    else:
+        carriers = carriers or {}
+        options = {name: previous.get(name) if carriers.get(name) in held else value
+                   for name, value in options.items()}
+        options = {name: value for name, value in options.items() if value is not None}
+    recorded = {path: content for path, content in files.items() if path not in held}
+    kept = {rel: digest for rel, digest in manifest.items()
+            if partial or os.path.join(root, rel) in held}
+    with staging_directory(root) as staging:
+        timings = emit_files(rebase(changed, root, staging), workers)
+        save_manifest(staging, rebase(recorded, root, staging), kept, options)
+        for directory in leaf_directories(changed):
+            os.makedirs(directory, exist_ok=True)
+        for path in changed:
+            os.replace(os.path.join(staging, relative_path(path, root)), path)
+        os.replace(os.path.join(staging, MANIFEST_NAME), os.path.join(root, MANIFEST_NAME))
+    for path in stale:
+        os.remove(path)
+    timings = [(path, seconds, size) for path, (_, seconds, size) in zip(changed, timings)]
+    conflicts = [path for path, reason in held.items() if reason == "conflict"]
+    return changed, stale, conflicts, timings
+
+class _ForwardOnly(io.RawIOBase):
+    """Hides seek/tell so zipfile always emits the streaming layout, file or pipe alike."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self.stream.write(data)
+
+def archive_mtime():
+    """Returns the fixed entry timestamp for archives, honouring SOURCE_DATE_EPOCH."""
+    return int(os.environ.get("SOURCE_DATE_EPOCH", 0))
+
+def write_archive(files, fmt, stream, directories=()):
+    """
+    Streams rendered files into a tar, tar.gz or zip archive without touching disk.
+
+    Entries are sorted and carry fixed timestamps, owners and modes, so the same
+    templates always produce byte-identical archives. `directories` become explicit
+    (empty) directory entries. `stream` may be unseekable, e.g. stdout.
+    """
+    mtime = archive_mtime()
+    entries = sorted([(path, None) for path in directories] + [(path, content) for path, content in files.items()])
+    if fmt == "zip":
+        stamp = time.gmtime(max(mtime, ZIP_EPOCH))[:6]
+        with zipfile.ZipFile(_ForwardOnly(stream), "w", zipfile.ZIP_DEFLATED) as archive:
+            for path, content in entries:
+                if content is None:
+                    info = zipfile.ZipInfo(path.rstrip("/") + "/", date_time=stamp)
+                    info.external_attr = (0o40755 << 16) | 0x10
+                    archive.writestr(info, b"")
+                else:
+                    info = zipfile.ZipInfo(path, date_time=stamp)
+                    info.external_attr = 0o100644 << 16
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    archive.writestr(info, content.encode("utf-8"))
+        return
+
+    compressed = gzip.GzipFile(filename="", mode="wb", fileobj=stream, mtime=mtime) if fmt == "tar.gz" else None
+    with tarfile.open(fileobj=compressed or stream, mode="w|", format=tarfile.PAX_FORMAT) as archive:
+        for path, content in entries:
+            info = tarfile.TarInfo(path)
+            info.mtime = mtime
+            if content is None:
+                info.type = tarfile.DIRTYPE
+                info.mode = 0o755
+                archive.addfile(info)
+            else:
+                data = content.encode("utf-8")
+                info.size = len(data)
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+    if compressed:
+        compressed.close()